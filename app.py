@@ -1,6 +1,9 @@
 from model import *
 
 if __name__ == "__main__":
+    # Fit the risk free rate forecasts in the background while the page loads (no-op on reruns)
+    warm_up_rfr_forecasts()
+
     st.title("Option Pricing Model")
     # Spacer between the title and the rest of the information
     st.write(" ")
@@ -176,9 +179,15 @@ if __name__ == "__main__":
         # Extra advanced user inputs
         with st.expander(label="⚙️ Click here for advanced settings", expanded=False) as advanced_settings_expander:
             MANUAL_risk_free_rate_dataset = st.selectbox("Use bond yields to project risk free rate", all_rfr_datasets, index=0)
+            MANUAL_risk_free_rate_method = st.selectbox("Risk free rate projection", rfr_projection_methods, index=0,
+                                                        help="Exponential Smoothing and Vasicek are fast closed form fits, Prophet is slower but more flexible")
             MANUAL_risk_free_rate = st.number_input("OR Manually input risk free rate (%)", min_value = 0.000, value=None, format="%.3f")
             MANUAL_volatility = st.number_input("Volatility (%)", min_value = 0.000, value=None, format="%.3f")
             MANUAL_stochastic_process = st.selectbox("Stochastic process", stochastic_processes, index=0)
+            MANUAL_pricing_engine = st.selectbox("Pricing engine", pricing_engines, index=0,
+                                                 help="Analytic uses Black-Scholes for Geometric Brownian Motion, other processes are always simulated")
+            MANUAL_exercise_style = st.selectbox("Exercise style", exercise_styles, index=0,
+                                                 help="American options are priced with Longstaff-Schwartz least squares monte carlo")
 
         # Button to submit inputs and checks to see if inputs exist
         if st.button("Calculate Option Price"):
@@ -212,7 +221,10 @@ if __name__ == "__main__":
                                                     stock_data_start="2022-01-01",
                                                     stock_data_end="2025-03-30",
                                                     rfr_suffix=str(MANUAL_risk_free_rate_dataset),
-                                                    simulations=10000)
+                                                    simulations=10000,
+                                                    pricing_engine=str(MANUAL_pricing_engine),
+                                                    exercise_style=str(MANUAL_exercise_style),
+                                                    rfr_method=str(MANUAL_risk_free_rate_method))
                     
                     # Extract model outputs
                     call_price = pricing_result.get("call price", "N/A")
@@ -223,6 +235,7 @@ if __name__ == "__main__":
                     historic_stock_price_data = pricing_result.get("stock prices", "N/A")
                     historic_stock_price_dates = pricing_result.get("stock dates", "N/A")
                     all_simulations = pricing_result.get("all simulations", "N/A")
+                    exercise_style = pricing_result.get("exercise style", "European")
                     calculation_loading_status = pricing_result.get("calculation status", "N/A")
                     # Display the results in two red-outlined boxes
                     st.markdown(OPTION_PRICE_DISPLAY.format(call_price="{:.2f}".format(float(call_price)), put_price="{:.2f}".format(float(put_price))), unsafe_allow_html=True)
@@ -254,8 +267,7 @@ if __name__ == "__main__":
                                     "Volatility": ("%", 2, volatility)
                                     }
         
-        greeks_call = calculate_greeks("call", spot_price, strike_price, time_to_expiry/365, risk_free_rate, volatility, 3)
-        greeks_put = calculate_greeks("put", spot_price, strike_price, time_to_expiry/365, risk_free_rate, volatility, 3)
+        greeks_call, greeks_put = calculate_call_put_greeks(spot_price, strike_price, time_to_expiry/365, risk_free_rate, volatility, 3)
 
         # Display key basic option pricing results/parameters
         with st.expander("Option Pricing Basic Results/Parameters", expanded=False, icon="🔢"):
@@ -329,17 +341,23 @@ if __name__ == "__main__":
             with option_varying_spot_graph_tab:
                 option_prices_graph, option_prices_ax = plt.subplots(figsize=(10,5))
 
-                spot_prices = np.linspace(0, 2 * strike_price, 100)
-                call_values = np.maximum(spot_prices - strike_price, 0)  # Call: max(S_T - K, 0)
-                put_values = np.maximum(strike_price - spot_prices, 0)   # Put: max(K - S_T, 0)
-
-                # Plot Call & Put Option Payoffs
-                call_line, = option_prices_ax.plot(spot_prices, call_values, label="Call Option", color='blue', linewidth=2)
-                put_line, = option_prices_ax.plot(spot_prices, put_values, label="Put Option", color='red', linewidth=2)
+                # One Crank-Nicolson solve values the options today for every spot price on the grid
+                option_value_grid = Crank_Nicolson_Pricer(strike_price, time_to_expiry/365, risk_free_rate, volatility,
+                                                          exercise_style=exercise_style, max_spot=3 * strike_price).solve()
+                spot_prices = option_value_grid["spot"]
+                shown = spot_prices <= 2 * strike_price
+                call_payoffs = np.maximum(spot_prices - strike_price, 0)  # Call: max(S_T - K, 0)
+                put_payoffs = np.maximum(strike_price - spot_prices, 0)   # Put: max(K - S_T, 0)
+
+                # Plot Call & Put Option Values with their payoffs at expiry for reference
+                call_line, = option_prices_ax.plot(spot_prices[shown], option_value_grid["call price"][shown], label="Call Option", color='blue', linewidth=2)
+                put_line, = option_prices_ax.plot(spot_prices[shown], option_value_grid["put price"][shown], label="Put Option", color='red', linewidth=2)
+                option_prices_ax.plot(spot_prices[shown], call_payoffs[shown], color='blue', linewidth=1, linestyle=':', alpha=0.6)
+                option_prices_ax.plot(spot_prices[shown], put_payoffs[shown], color='red', linewidth=1, linestyle=':', alpha=0.6)
                 
                 # Add vertical dotted line at spot price & legend update
                 option_prices_ax.axvline(spot_price, color='black', linewidth=1, linestyle='--', label=f"Spot Price: ${spot_price:.2f}")
-                option_prices_ax.set_title("European Call & Put Option Payoff at Expiration", fontsize=14)
+                option_prices_ax.set_title(f"{exercise_style} Call & Put Option Value Today (dotted: payoff at expiration)", fontsize=14)
                 option_prices_ax.set_xlabel("Spot Price", fontsize=12)
                 option_prices_ax.set_ylabel("Option Value", fontsize=12)
                 option_prices_ax.legend(loc="upper right", fontsize=12, frameon=True, fancybox=True, edgecolor="black")
@@ -365,26 +383,29 @@ if __name__ == "__main__":
                 st.pyplot(option_prices_graph)
             
             with monte_carlo_graph_tab:
-                monte_carlo_graph, monte_carlo_ax = plt.subplots(figsize=(10,5))
+                if all_simulations is None:
+                    st.info("Priced analytically with Black-Scholes. Select the Monte Carlo pricing engine in the advanced settings to view simulated paths.")
+                else:
+                    monte_carlo_graph, monte_carlo_ax = plt.subplots(figsize=(10,5))
                 
-                for path in all_simulations:
-                    rand_col = np.random.rand(3,)
-                    monte_carlo_ax.plot(path, color=rand_col, alpha=0.5)
+                    for path in all_simulations:
+                        rand_col = np.random.rand(3,)
+                        monte_carlo_ax.plot(path, color=rand_col, alpha=0.5)
                 
-                avg_path = np.mean(all_simulations, axis=0)
-                monte_carlo_ax.plot(avg_path, color='red', label='Average Path', linewidth=2)
+                    avg_path = np.mean(all_simulations, axis=0)
+                    monte_carlo_ax.plot(avg_path, color='red', label='Average Path', linewidth=2)
 
-                # Formatting
-                monte_carlo_ax.set_xlim(0, time_to_expiry)
-                monte_carlo_ax.set_title(f'Simulated Price Paths', fontsize=14, fontweight="bold")
-                monte_carlo_ax.set_xlabel('Time Steps (days)', fontsize=12)
-                monte_carlo_ax.set_ylabel('Price', fontsize=12)
-                monte_carlo_ax.legend(loc="upper left", fontsize=12)
-                monte_carlo_ax.grid(True, linestyle="--", alpha=0.7)
+                    # Formatting
+                    monte_carlo_ax.set_xlim(0, time_to_expiry)
+                    monte_carlo_ax.set_title(f'Simulated Price Paths', fontsize=14, fontweight="bold")
+                    monte_carlo_ax.set_xlabel('Time Steps (days)', fontsize=12)
+                    monte_carlo_ax.set_ylabel('Price', fontsize=12)
+                    monte_carlo_ax.legend(loc="upper left", fontsize=12)
+                    monte_carlo_ax.grid(True, linestyle="--", alpha=0.7)
 
-                monte_carlo_ax.xaxis.set_major_locator(mticker.MaxNLocator(integer=True))
+                    monte_carlo_ax.xaxis.set_major_locator(mticker.MaxNLocator(integer=True))
 
-                st.pyplot(monte_carlo_graph)
+                    st.pyplot(monte_carlo_graph)
 
         # Put this after everything on the main page has finished loading to finish status loaders
         result_loading_placeholder_status1.update(label="Results now completed!", state="complete", expanded=False)
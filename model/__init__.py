@@ -3,12 +3,25 @@ from .utils import *
 
 # Import Classes
 from .euro_option_simulation import European_Option_Simulation
+from .american_option_simulation import American_Option_Simulation
+from .exotic_option_simulation import Exotic_Option_Simulation
+from .path_accumulator import Path_Accumulator
+from .multi_asset_simulation import Multi_Asset_Simulation
+from .finite_difference_pricer import Crank_Nicolson_Pricer
+from .lattice_pricer import Lattice_Pricer
+from .numba_kernels import NUMBA_AVAILABLE
+from .price_history_cache import Price_History_Cache, get_price_history_cache, set_market_data_provider
+from .market_data_provider import Market_Data_Provider, Yahoo_Finance_Provider, Local_Directory_Provider
 from .option_strike import Strike
 from .stochastic_process import Stochastic_Process
-from .rfr_projection import RFR_Projection
+from .rfr_projection import RFR_Projection, warm_up_rfr_forecasts
+from .rfr_forecast_cache import RFR_Forecast_Cache, get_rfr_forecast_cache
+from .rate_dataset_store import Rate_Dataset_Store, get_rate_dataset_store
 from .volaility_model_MLE import Return_Volatility_Minimisation
 from .volatility_model_ML import ML_Volatility_Model
 from .multi_plot_navigator import Multi_Plot_Navigator
+from .monte_carlo_accumulator import Welford_Accumulator
+from .simulation_pool import Simulation_Pool, get_simulation_pool
 #from .volaility_model import EWMA_Volatility
 
 # Import Functions
@@ -16,11 +29,15 @@ from .udf import (supress_warnings, get_end_date,
                 get_stock_data, get_rfr,
                 get_volatility, get_spot_price,
                 display_option_pricing_summary, run_pricing_model,
-                format_value, get_available_tickers, calculate_greeks,
-                add_indicators, fetch_stock_data
+                format_value, get_available_tickers, calculate_greeks, calculate_call_put_greeks,
+                add_indicators, fetch_stock_data, run_monte_carlo_simulation,
+                run_american_simulation, get_multi_asset_stock_data
                 )
+from .analytic_pricing import black_scholes_price, black_scholes_greeks, implied_volatility_batch, \
+     heston_price, heston_characteristic_function, merton_price
 
 # Import constants
-from .constants import all_tickers, all_rfr_datasets, stochastic_processes
+from .constants import all_tickers, all_rfr_datasets, stochastic_processes, control_variates, samplers, pricing_engines, \
+     exercise_styles, exotic_options, multi_asset_options, lattice_types, rfr_projection_methods
 from .website_scripts.html_constants import MODEL_ERROR_MSG, MODEL_DESCRIPTION, LINKEDIN_FLEX, \
      OPTION_PRICE_DISPLAY, OPTION_GREEK_DESCRIPTION, SIDEBAR_WIDTH
@@ -0,0 +1,87 @@
+from .utils import *
+from .option_strike import Strike
+from .euro_option_simulation import European_Option_Simulation
+
+class American_Option_Simulation(European_Option_Simulation):
+    """Prices American/Bermudan options with Longstaff-Schwartz least-squares Monte Carlo."""
+
+    # exercise_frequency = Number of time steps between exercise dates (1 = American, daily exercise)
+    # basis_degree = Degree of the polynomial in S/K used to estimate the continuation value
+    def __init__(self, stochastic_process_type: str, strike: Strike, sims: int, initial_price: float, drift: float, \
+                 delta_t: float, volatility: float, tte: float, rfr_appropriate_dates, seed: int = None, \
+                 antithetic: bool = False, sampler: str = "Pseudo-Random", exercise_frequency: int = 1, basis_degree: int = 3, \
+                 process_parameters: dict = None):
+        super().__init__(stochastic_process_type, strike, sims, initial_price, drift, delta_t, volatility, tte,
+                         rfr_appropriate_dates, seed=seed, antithetic=antithetic, sampler=sampler,
+                         process_parameters=process_parameters)
+        self.exercise_frequency = exercise_frequency
+        self.basis_degree = basis_degree
+
+    def run_longstaff_schwartz(self, seed_sequence: np.random.SeedSequence = None):
+        """
+        Simulates the path matrix once and prices the American call and put by backward induction.
+
+        At every exercise date the discounted future cash flows of the in-the-money paths are regressed
+        on a polynomial in S/K, and a path exercises when its immediate payoff beats the fitted
+        continuation value. Every step of the induction works on whole columns of the path matrix.
+
+        Returns
+        -------
+        tuple
+            (call price, put price, all simulations as a (sims, steps + 1) array)
+        """
+        stochastic_process = self.get_stochastic_process(seed_sequence)
+        steps = self.get_steps()
+
+        normals = None
+        if self.antithetic:
+            normals = stochastic_process.standard_normals(self.sims, steps, antithetic=True)
+        all_simulations = stochastic_process.simulate_paths(self.sims, steps, normals)
+
+        # Constant per-step discount factor matching the overall discount factor to expiry
+        step_discount = self.get_discount_factor() ** (1 / steps)
+        exercise_steps = np.arange(steps - self.exercise_frequency, 0, -self.exercise_frequency)
+
+        # Time-major copy so each exercise date is a contiguous row
+        paths_by_step = np.ascontiguousarray(all_simulations.T)
+        call_price = self.backward_induction(paths_by_step, exercise_steps, step_discount, np.maximum(paths_by_step - self.strike.Strike, 0))
+        put_price = self.backward_induction(paths_by_step, exercise_steps, step_discount, np.maximum(self.strike.Strike - paths_by_step, 0))
+
+        return call_price, put_price, all_simulations
+
+    def backward_induction(self, paths, exercise_steps, step_discount: float, exercise_values):
+        """
+        Longstaff-Schwartz backward induction for one payoff.
+
+        :param paths: (steps + 1, sims) simulated prices, one row per time step
+        :param exercise_steps: Exercise dates as step indices in decreasing order (excluding 0 and expiry)
+        :param step_discount: Discount factor for a single time step
+        :param exercise_values: (steps + 1, sims) immediate exercise payoff of every path at every step
+        :return: Option price at time 0
+        """
+        steps = paths.shape[0] - 1
+
+        # Cash flows start at expiry and are discounted back to each exercise date in turn
+        cash_flows = exercise_values[-1].copy()
+        current_step = steps
+
+        for step in exercise_steps:
+            cash_flows *= step_discount ** (current_step - step)
+            current_step = step
+
+            in_the_money = np.flatnonzero(exercise_values[step] > 0)
+            if len(in_the_money) <= self.basis_degree + 1:
+                continue
+
+            basis = np.polynomial.polynomial.polyvander(paths[step, in_the_money] / self.strike.Strike, self.basis_degree)
+            # Normal equations of the small (degree + 1) least-squares problem, much cheaper than lstsq here
+            coefficients = np.linalg.solve(basis.T @ basis, basis.T @ cash_flows[in_the_money])
+            continuation_values = basis @ coefficients
+
+            exercise_now = exercise_values[step, in_the_money] > continuation_values
+            cash_flows[in_the_money[exercise_now]] = exercise_values[step, in_the_money[exercise_now]]
+
+        cash_flows *= step_discount ** current_step
+
+        # Exercising immediately is also allowed
+        return max(cash_flows.mean(), exercise_values[0, 0])
@@ -0,0 +1,335 @@
+from .utils import np, si, ndtr
+
+def black_scholes_price(S, K, T, r, sigma, option_type="call"):
+    """
+    Black-Scholes price of a European call or put option.
+
+    Inputs may be floats or NumPy arrays and are broadcast against each other.
+
+    Parameters
+    ----------
+    S : float or NDArray
+        Current stock price (Spot price).
+    K : float or NDArray
+        Strike price of the option.
+    T : float or NDArray
+        Time to expiry (in years).
+    r : float or NDArray
+        Risk-free interest rate (as a decimal, e.g., 0.05 for 5%).
+    sigma : float or NDArray
+        Volatility of the underlying asset (as a decimal, e.g., 0.2 for 20%).
+    option_type : str, optional
+        "call" or "put" (default: "call").
+
+    Returns
+    -------
+    float or NDArray
+        The option price.
+
+    Example
+    -------
+    >>> round(float(black_scholes_price(100, 100, 1, 0.05, 0.2, "call")), 4)
+    10.4506
+    """
+    d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
+    d2 = d1 - sigma * np.sqrt(T)
+
+    if option_type.lower() == "call":
+        return S * si.norm.cdf(d1) - K * np.exp(-r * T) * si.norm.cdf(d2)
+    elif option_type.lower() == "put":
+        return K * np.exp(-r * T) * si.norm.cdf(-d2) - S * si.norm.cdf(-d1)
+    else:
+        raise ValueError("Invalid option type. Use 'call' or 'put'.")
+
+def black_scholes_greeks(S, K, T, r, sigma, option_type="call"):
+    """
+    Black-Scholes price and Greeks of European options, vectorised over arrays of contracts.
+
+    All inputs are broadcast against each other and d1, d2, the normal pdf and cdf are computed
+    once and shared by every output, so a whole book can be revalued in a single pass.
+
+    Parameters
+    ----------
+    S, K, T, r, sigma : float or NDArray
+        Spot price, strike, time to expiry (years), risk-free rate and volatility (decimals).
+    option_type : str or array-like of str
+        "call" or "put" for every contract, or an array of them broadcastable against the other inputs.
+
+    Returns
+    -------
+    dict
+        A dictionary of arrays:
+        - "price": Option price.
+        - "delta": Sensitivity to stock price changes.
+        - "gamma": Sensitivity of Delta to stock price changes.
+        - "theta": Time decay of the option price (per year).
+        - "vega": Sensitivity to a unit change in volatility.
+        - "rho": Sensitivity to a unit change in the interest rate.
+
+    Example
+    -------
+    >>> greeks = black_scholes_greeks([100, 100], 100, 1, 0.05, 0.2, ["call", "put"])
+    >>> greeks["delta"].round(4)
+    array([ 0.6368, -0.3632])
+    """
+    # Lower-case only the distinct labels rather than every contract's string
+    labels, label_index = np.unique(np.asarray(option_type, dtype=str), return_inverse=True)
+    labels = np.char.lower(labels)
+    if not np.all((labels == "call") | (labels == "put")):
+        raise ValueError("Invalid option type. Use 'call' or 'put'.")
+    is_call = (labels == "call")[label_index].reshape(np.shape(option_type))
+
+    S, K, T, r, sigma, is_call = np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in (S, K, T, r, sigma)), is_call
+    )
+
+    sqrt_T = np.sqrt(T)
+    d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * sqrt_T)
+    d2 = d1 - sigma * sqrt_T
+
+    # +1 for calls and -1 for puts turns every call formula into its put counterpart
+    sign = np.where(is_call, 1.0, -1.0)
+    pdf_d1 = np.exp(-0.5 * d1**2) / np.sqrt(2 * np.pi)
+    cdf_d1 = ndtr(sign * d1)
+    cdf_d2 = ndtr(sign * d2)
+    discounted_strike = K * np.exp(-r * T)
+
+    return {
+        "price": sign * (S * cdf_d1 - discounted_strike * cdf_d2),
+        "delta": sign * cdf_d1,
+        "gamma": pdf_d1 / (S * sigma * sqrt_T),
+        "theta": -(S * pdf_d1 * sigma) / (2 * sqrt_T) - sign * r * discounted_strike * cdf_d2,
+        "vega": S * pdf_d1 * sqrt_T,
+        "rho": sign * K * T * np.exp(-r * T) * cdf_d2
+    }
+
+def implied_volatility_batch(market_prices, S, K, T, r, option_type="call", tol: float = 1e-8, max_iter: int = 50):
+    """
+    Implied volatilities of many European options at once.
+
+    Puts are turned into calls with put-call parity, the Corrado-Miller approximation gives the
+    starting volatility, and safeguarded Halley steps on vega refine every unconverged option
+    together. Each option keeps a bracket around its root and falls back to bisection
+    whenever a step leaves it.
+
+    Parameters
+    ----------
+    market_prices : float or NDArray
+        Observed option prices.
+    S, K, T, r : float or NDArray
+        Spot price, strike, time to expiry (years) and risk-free rate, broadcast against market_prices.
+    option_type : str or array-like of str
+        "call" or "put" for every option, or an array of them (default: "call").
+    tol : float, optional
+        Convergence tolerance on the price, relative to the option's time value (default: 1e-8). A relative
+        tolerance keeps cheap options, whose whole price is below any absolute tolerance, from being
+        reported as converged at an arbitrary volatility.
+    max_iter : int, optional
+        Maximum number of Halley iterations (default: 50).
+
+    Returns
+    -------
+    NDArray
+        Implied volatilities (as decimals). Prices outside the no-arbitrage bounds, prices without
+        time value (at their intrinsic value, where every low volatility fits), options with T <= 0
+        and options that fail to converge are NaN.
+
+    Example
+    -------
+    >>> implied_volatility_batch([10.4506, 5.5735], 100, 100, 1, 0.05, ["call", "put"]).round(4)
+    array([0.2, 0.2])
+    """
+    labels, label_index = np.unique(np.asarray(option_type, dtype=str), return_inverse=True)
+    labels = np.char.lower(labels)
+    if not np.all((labels == "call") | (labels == "put")):
+        raise ValueError("Invalid option type. Use 'call' or 'put'.")
+    is_call = (labels == "call")[label_index].reshape(np.shape(option_type))
+
+    prices, S, K, T, r, is_call = np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in (market_prices, S, K, T, r)), is_call
+    )
+    shape = prices.shape
+    prices, S, K, T, r = (np.ravel(value) for value in (prices, S, K, T, r))
+    is_call = np.ravel(is_call)
+
+    # Solve everything as a call: C = P + S - K exp(-rT)
+    discounted_strike = K * np.exp(-r * T)
+    call_prices = np.where(is_call, prices, prices + S - discounted_strike)
+
+    # Arbitrage-free calls lie strictly between the discounted intrinsic value and the spot, and only
+    # the time value above the intrinsic value carries information about the volatility
+    time_value = call_prices - np.maximum(S - discounted_strike, 0)
+    # Prices carry rounding errors of a few ulps of S and K (more after put-call parity), a time value
+    # below that cannot be told apart from none and the price can't be matched more closely than that
+    price_noise = 1e3 * np.finfo(float).eps * (S + discounted_strike)
+    valid = (T > 0) & (time_value > price_noise) & (call_prices < S)
+    sigma = np.full(prices.shape, np.nan)
+
+    index = np.flatnonzero(valid)
+    S_i, X_i, T_i, C_i = S[index], discounted_strike[index], T[index], call_prices[index]
+    tolerance_i = np.maximum(tol * time_value[index], price_noise[index])
+    sqrt_T = np.sqrt(T_i)
+
+    # Corrado-Miller starting point
+    half_moneyness = (S_i - X_i) / 2
+    discriminant = np.maximum((C_i - half_moneyness)**2 - (S_i - X_i)**2 / np.pi, 0)
+    guess = np.sqrt(2 * np.pi / T_i) / (S_i + X_i) * (C_i - half_moneyness + np.sqrt(discriminant))
+    sigma_i = np.clip(np.nan_to_num(guess, nan=0.2), 1e-3, 5.0)
+
+    lower = np.full(index.shape, 1e-8)
+    upper = np.full(index.shape, 10.0)
+    active = np.arange(len(index))
+
+    for _ in range(max_iter):
+        if len(active) == 0:
+            break
+
+        s, x, sq, vol = S_i[active], X_i[active], sqrt_T[active], sigma_i[active]
+        d1 = np.log(s / x) / (vol * sq) + 0.5 * vol * sq
+        d2 = d1 - vol * sq
+        difference = s * ndtr(d1) - x * ndtr(d2) - C_i[active]
+
+        converged = np.abs(difference) < tolerance_i[active]
+        active, s, sq, vol, d1, d2, difference = (
+            value[~converged] for value in (active, s, sq, vol, d1, d2, difference)
+        )
+
+        # Shrink the bracket: the call price increases with volatility
+        too_high = difference > 0
+        upper[active] = np.where(too_high, vol, upper[active])
+        lower[active] = np.where(too_high, lower[active], vol)
+
+        vega = s * np.exp(-0.5 * d1**2) / np.sqrt(2 * np.pi) * sq
+        vomma = vega * d1 * d2 / vol
+        newton_step = np.divide(difference, vega, out=np.full_like(vega, np.inf), where=vega > 0)
+        halley_step = newton_step / (1 - 0.5 * newton_step * vomma / np.where(vega > 0, vega, 1))
+        updated = vol - halley_step
+
+        outside = ~np.isfinite(updated) | (updated <= lower[active]) | (updated >= upper[active])
+        sigma_i[active] = np.where(outside, 0.5 * (lower[active] + upper[active]), updated)
+
+    # Anything still active did not converge within max_iter
+    sigma_i[active] = np.nan
+    sigma[index] = sigma_i
+
+    return sigma.reshape(shape)
+
+def heston_characteristic_function(u, S, T, r, initial_variance, mean_reversion, long_run_variance, vol_of_vol, correlation):
+    """
+    Characteristic function E[exp(iu ln S_T)] of the Heston log-price, in the "little trap" form of
+    Albrecher et al. (2007) which avoids branch cut jumps of the complex logarithm for long maturities.
+
+    u may be complex and is broadcast against the other inputs.
+    """
+    kappa, theta, xi, rho = mean_reversion, long_run_variance, vol_of_vol, correlation
+    iu = 1j * u
+
+    beta = kappa - rho * xi * iu
+    d = np.sqrt(beta**2 + xi**2 * (iu + u**2))
+    g = (beta - d) / (beta + d)
+    exp_dT = np.exp(-d * T)
+
+    C = iu * r * T + kappa * theta / xi**2 * ((beta - d) * T - 2 * np.log((1 - g * exp_dT) / (1 - g)))
+    D = (beta - d) / xi**2 * (1 - exp_dT) / (1 - g * exp_dT)
+
+    return np.exp(C + D * initial_variance + iu * np.log(S))
+
+def heston_price(S, K, T, r, initial_variance, mean_reversion, long_run_variance, vol_of_vol, correlation,
+                 option_type="call", integration_nodes: int = 256, integration_limit: float = 200.0):
+    """
+    Semi-analytic Heston price of European options from the characteristic function.
+
+    The two Gil-Pelaez probabilities P1 and P2 are integrated with a fixed Gauss-Legendre rule on
+    [0, integration_limit], evaluated for every contract at once, and C = S P1 - K exp(-rT) P2.
+    Puts follow from put-call parity. Useful for checking the Monte Carlo Heston engine and for calibration.
+
+    Parameters
+    ----------
+    S, K, T, r : float or NDArray
+        Spot price, strike, time to expiry (years) and risk-free rate, broadcast against each other.
+    initial_variance, mean_reversion, long_run_variance, vol_of_vol, correlation : float
+        Heston parameters v0, kappa, theta, xi and rho.
+    option_type : str, optional
+        "call" or "put" (default: "call").
+    integration_nodes : int, optional
+        Number of Gauss-Legendre nodes (default: 256).
+    integration_limit : float, optional
+        Upper truncation of the Fourier integral (default: 200).
+
+    Returns
+    -------
+    float or NDArray
+        The option price.
+
+    Example
+    -------
+    >>> round(float(heston_price(100, 100, 1, 0.05, 0.04, 2.0, 0.04, 1e-4, 0.0)), 4)  # Black-Scholes limit
+    10.4506
+    """
+    S, K, T, r = np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in (S, K, T, r)))
+
+    nodes, weights = np.polynomial.legendre.leggauss(integration_nodes)
+    u = 0.5 * integration_limit * (nodes + 1)
+    weights = 0.5 * integration_limit * weights
+
+    # Integration nodes run along a new last axis
+    S_, K_, T_, r_ = (value[..., None] for value in (S, K, T, r))
+    heston_parameters = (initial_variance, mean_reversion, long_run_variance, vol_of_vol, correlation)
+    phi = heston_characteristic_function(u, S_, T_, r_, *heston_parameters)
+    # phi(u - i) / phi(-i) is the characteristic function under the stock measure, phi(-i) = S exp(rT)
+    phi_shifted = heston_characteristic_function(u - 1j, S_, T_, r_, *heston_parameters) / (S_ * np.exp(r_ * T_))
+
+    kernel = np.exp(-1j * u * np.log(K_)) / (1j * u)
+    P1 = 0.5 + (np.real(kernel * phi_shifted) * weights).sum(axis=-1) / np.pi
+    P2 = 0.5 + (np.real(kernel * phi) * weights).sum(axis=-1) / np.pi
+
+    call = S * P1 - K * np.exp(-r * T) * P2
+
+    if option_type.lower() == "call":
+        return call
+    elif option_type.lower() == "put":
+        return call - S + K * np.exp(-r * T)
+    else:
+        raise ValueError("Invalid option type. Use 'call' or 'put'.")
+
+def merton_price(S, K, T, r, sigma, jump_intensity, jump_mean, jump_volatility, option_type="call", terms: int = 60):
+    """
+    Merton (1976) jump diffusion price of European options as a Poisson-weighted series of Black-Scholes prices.
+
+    Conditional on n jumps the log-price is normal, so the price is
+    sum_n Poisson(n; lambda' T) * BS(S, K, T, r_n, sigma_n) with lambda' = lambda (1 + k),
+    sigma_n^2 = sigma^2 + n delta^2 / T and r_n = r - lambda k + n log(1 + k) / T, where
+    k = exp(jump_mean + delta^2 / 2) - 1. All terms are evaluated at once along an extra axis.
+
+    Parameters
+    ----------
+    S, K, T, r, sigma : float or NDArray
+        Spot price, strike, time to expiry (years), risk-free rate and diffusion volatility.
+    jump_intensity, jump_mean, jump_volatility : float
+        Expected jumps per year (lambda), mean and standard deviation (delta) of the log jump size.
+    option_type : str, optional
+        "call" or "put" (default: "call").
+    terms : int, optional
+        Number of series terms (default: 60).
+
+    Returns
+    -------
+    float or NDArray
+        The option price.
+
+    Example
+    -------
+    >>> round(float(merton_price(100, 100, 1, 0.05, 0.2, 0.0, -0.05, 0.1)), 4)  # No jumps gives Black-Scholes
+    10.4506
+    """
+    S, K, T, r, sigma = np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in (S, K, T, r, sigma)))
+
+    k = np.exp(jump_mean + 0.5 * jump_volatility**2) - 1
+    n = np.arange(terms)
+    S_, K_, T_, r_, sigma_ = (value[..., None] for value in (S, K, T, r, sigma))
+
+    weights = si.poisson.pmf(n, jump_intensity * (1 + k) * T_)
+    sigma_n = np.sqrt(sigma_**2 + n * jump_volatility**2 / T_)
+    r_n = r_ - jump_intensity * k + n * np.log(1 + k) / T_
+
+    return (weights * black_scholes_price(S_, K_, T_, r_n, sigma_n, option_type)).sum(axis=-1)
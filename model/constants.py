@@ -16,5 +16,43 @@ rfr_datasets_mapping = {
 # All datasets available to use to calculate risk free rates to use in streamlit
 all_rfr_datasets = [ key + "yr" for key in list(rfr_datasets_mapping.keys()) ]
 
+# Methods RFR_Projection can project risk free rates with ("Prophet" needs the optional prophet package)
+rfr_projection_methods = ["Prophet", "Exponential Smoothing", "Vasicek"]
+
 # All stochastic processes available to use to calculate asset price in the future
-stochastic_processes = ["Geometric Brownian Motion", "Arithmetic Brownian Motion", "Multifractal Model of Asset Returns"]
\ No newline at end of file
+stochastic_processes = ["Geometric Brownian Motion", "Arithmetic Brownian Motion", "Multifractal Model of Asset Returns",
+                        "Heston Stochastic Volatility", "Merton Jump Diffusion"]
+
+# Control variates available to reduce the variance of the monte carlo option price
+control_variates = ["Black-Scholes", "Terminal Price"]
+
+# Samplers available to draw the normal shocks driving the stochastic processes
+samplers = ["Pseudo-Random", "Sobol"]
+
+# Engines available to price European options ("Analytic" only applies to geometric brownian motion)
+pricing_engines = ["Analytic", "Monte Carlo"]
+
+# Exercise styles available to price ("American" is priced with Longstaff-Schwartz least squares monte carlo)
+exercise_styles = ["European", "American"]
+
+# Path-dependent options priced by the streaming exotic option simulation (Up/Down barrier options need an up/down barrier)
+exotic_options = ["Asian Arithmetic", "Asian Geometric", "Lookback Fixed Strike", "Lookback Floating Strike",
+                  "Up-and-Out", "Up-and-In", "Down-and-Out", "Down-and-In"]
+
+# Options on several correlated assets priced by the multi asset simulation
+multi_asset_options = ["Basket", "Spread", "Best-of", "Worst-of"]
+
+# Trees available to the lattice pricer
+lattice_types = ["Binomial", "Trinomial"]
+
+# Directory of the on-disk daily price history cache (one Parquet file per ticker)
+price_history_cache_dir = "data/price_history"
+
+# Directory of <ticker>.parquet / <ticker>.csv price files read by the local directory market data provider
+market_data_dir = "data/market_data"
+
+# Directory of the on-disk cache of fitted risk free rate forecasts
+rfr_forecast_cache_dir = "data/rfr_forecasts"
+
+# Directory of the memory-mapped .npy copies of the bundled rate datasets
+rate_store_dir = "data/rate_store"
\ No newline at end of file
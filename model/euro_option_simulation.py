@@ -1,13 +1,20 @@
 from .utils import *
 from .option_strike import Strike
 from .stochastic_process import Stochastic_Process
+from .monte_carlo_accumulator import Welford_Accumulator
+from .simulation_pool import get_simulation_pool
+from .analytic_pricing import black_scholes_price
+from .constants import control_variates
+from time import perf_counter
 
 class European_Option_Simulation:
     
     # tte = Time to Expiration
     # rfr = Risk Free Rate
     def __init__(self, stochastic_process_type: str, strike: Strike, sims: int, initial_price: float, drift: float, \
-                 delta_t: float, volatility: float, tte: float, rfr_appropriate_dates):
+                 delta_t: float, volatility: float, tte: float, rfr_appropriate_dates, seed: int = None, \
+                 antithetic: bool = False, control_variate: str = None, sampler: str = "Pseudo-Random", \
+                 process_parameters: dict = None):
         self.stochastic_process_type = stochastic_process_type
         self.strike = strike
         self.sims = sims
@@ -17,42 +24,375 @@ class European_Option_Simulation:
         self.volatility = volatility
         self.tte = tte
         self.rfr_range = rfr_appropriate_dates
+        # Every batch, chunk and worker draws from its own child of this sequence, so a fixed seed
+        # reproduces a run exactly while the streams stay statistically independent
+        self.seed = seed
+        self.seed_sequence = np.random.SeedSequence(seed)
 
-    def run_simulation_batch(self, batch_size: int):
-        simulations = []
-        for _ in range(batch_size):
-            stochastic_process = Stochastic_Process(self.stochastic_process_type, self.initial_price, self.drift, self.delta_t, self.volatility)
-            tte_initial = self.tte
+        # Variance reduction: antithetic pairs (Z, -Z) and/or a control variate from control_variates
+        self.antithetic = antithetic
+        self.control_variate = control_variate
+        # Normal shock sampler from samplers ("Sobol" gives randomised quasi-monte carlo)
+        self.sampler = sampler
+        # Extra keyword arguments for Stochastic_Process, e.g. the Heston variance parameters
+        self.process_parameters = process_parameters or {}
 
-            # while option has not expired move and decrement to next time step
-            while (tte_initial - stochastic_process.delta_t) > 0:
-                tte_initial -= stochastic_process.delta_t
-                stochastic_process.time_step()
+        if control_variate is not None and control_variate.upper() not in [c.upper() for c in control_variates]:
+            raise ValueError(f"Unknown control variate: {control_variate}. Use one of {control_variates}")
+        if control_variate is not None and control_variate.upper() == "Terminal Price".upper() and \
+                self.stochastic_process_type.upper() == "Multifractal Model of Asset Returns".upper():
+            raise ValueError("The terminal price control variate needs a closed-form E[S_T], which MMAR does not have")
 
-            simulations.append(stochastic_process.prices)
-        
-        return simulations
+    def get_steps(self):
+        """Number of delta_t time steps needed to reach expiry."""
+        return max(int(round(self.tte / self.delta_t)), 1)
+
+    def get_stochastic_process(self, seed_sequence: np.random.SeedSequence = None):
+        """Builds the stochastic process with a generator from seed_sequence (or the next spawned stream)."""
+        if seed_sequence is None:
+            seed_sequence = self.seed_sequence.spawn(1)[0]
+
+        return Stochastic_Process(self.stochastic_process_type, self.initial_price, self.drift, self.delta_t, self.volatility,
+                                  rng=np.random.default_rng(seed_sequence), sampler=self.sampler, **self.process_parameters)
+
+    def run_simulation_batch(self, batch_size: int, seed_sequence: np.random.SeedSequence = None):
+        """Simulates a batch of price paths as a (batch_size, steps + 1) array."""
+        stochastic_process = self.get_stochastic_process(seed_sequence)
+
+        return stochastic_process.simulate_paths(batch_size, self.get_steps())
     
 
-    def run_multiprocessing(self, processes: int):
-        batch_size = self.sims // processes
-        batches = [batch_size] * processes
+    def run_terminal_batch(self, batch_size: int, seed_sequence: np.random.SeedSequence = None):
+        """Samples a batch of terminal prices S_T as a (batch_size,) array."""
+        stochastic_process = self.get_stochastic_process(seed_sequence)
+
+        return stochastic_process.simulate_terminal(batch_size, self.get_steps() * self.delta_t)
+
+    def get_discount_factor(self, expiry: float = None):
+        """
+        Discount factor to an expiry (in years, default tte) using the average rate up to that date in rfr_range.
+
+        Paths reach an expiry on the delta_t step grid, so the rate is applied over that simulated horizon.
+        rfr_range only covers tte, a later expiry raises a ValueError.
+        """
+        expiry = self.tte if expiry is None else expiry
+        if expiry > self.tte:
+            raise ValueError(f"Expiry {expiry} is beyond the time to expiry {self.tte} covered by the simulation")
+        rates = self.rfr_range['Rate']
+
+        if 'Date' in self.rfr_range.columns and expiry < self.tte:
+            dates = pd.to_datetime(self.rfr_range['Date'])
+            rates = rates[dates <= dates.iloc[0] + timedelta(days=expiry * 365)]
+
+        horizon = max(int(round(expiry / self.delta_t)), 1) * self.delta_t
+        return math.exp(-horizon * np.average(rates))
+
+    def discounted_payoffs(self, terminal_prices):
+        """Present value of the call and put payoff of each terminal price as a (n, 2) array."""
+        payoffs = np.empty((len(terminal_prices), 2))
+        payoffs[:, 0] = np.maximum(terminal_prices - self.strike.Strike, 0)  # Call: max(S_T - K, 0)
+        payoffs[:, 1] = np.maximum(self.strike.Strike - terminal_prices, 0)  # Put: max(K - S_T, 0)
+
+        # Compute present value of both option payoffs
+        return payoffs * self.get_discount_factor()
+
+    def price_chain(self, strikes, expiries, sims: int = None, seed_sequence: np.random.SeedSequence = None):
+        """
+        Prices a full option chain from a single simulation.
+
+        Paths are simulated once to the longest expiry and the price is recorded at every requested
+        expiry. The call and put payoffs of the whole strike grid are then one broadcast operation per
+        expiry, and each expiry is discounted with its own average rate from rfr_range.
+
+        Parameters
+        ----------
+        strikes : array-like
+            Strike prices of the chain.
+        expiries : array-like
+            Times to expiry in years (same units as tte), none later than tte.
+        sims : int, optional
+            Number of paths (default: self.sims).
+
+        Returns
+        -------
+        dict
+            "strikes", "expiries", and "call prices" / "put prices" arrays of shape (len(expiries), len(strikes)).
+        """
+        strikes = np.asarray(strikes, dtype=float)
+        expiries = np.asarray(expiries, dtype=float)
+        sims = self.sims if sims is None else sims
+        if np.any(expiries > self.tte):
+            raise ValueError(f"Expiries {expiries[expiries > self.tte]} are beyond the time to expiry {self.tte} covered by the simulation")
+
+        # Simulate on the step grid so chain prices match single-expiry prices for the same expiry
+        horizons = np.maximum(np.round(expiries / self.delta_t), 1) * self.delta_t
+        order = np.argsort(horizons)
+        unique_horizons, horizon_index = np.unique(horizons[order], return_inverse=True)
+
+        stochastic_process = self.get_stochastic_process(seed_sequence)
+        normals = None
+        if self.antithetic and stochastic_process.has_exact_transition():
+            normals = stochastic_process.standard_normals(sims, len(unique_horizons), antithetic=True)
+        prices_at_horizons = stochastic_process.simulate_horizons(sims, unique_horizons, normals)
+
+        call_prices = np.empty((len(expiries), len(strikes)))
+        put_prices = np.empty((len(expiries), len(strikes)))
+
+        for position, expiry_index in enumerate(order):
+            prices_at_expiry = prices_at_horizons[:, horizon_index[position], None]
+            discount_factor = self.get_discount_factor(expiries[expiry_index])
+
+            call_prices[expiry_index] = np.maximum(prices_at_expiry - strikes, 0).mean(axis=0) * discount_factor
+            put_prices[expiry_index] = np.maximum(strikes - prices_at_expiry, 0).mean(axis=0) * discount_factor
+
+        return {
+            "strikes": strikes,
+            "expiries": expiries,
+            "call prices": call_prices,
+            "put prices": put_prices
+        }
+
+    def simulate_batch(self, batch_size: int, terminal_only: bool = False, seed_sequence: np.random.SeedSequence = None):
+        """
+        Simulates a batch with the selected variance reduction and returns (simulations, payoffs, controls).
+
+        simulations are the (batch_size, steps + 1) paths, or the (batch_size,) terminal prices if terminal_only.
+        payoffs are the (batch_size, 2) discounted call and put payoffs and controls the matching control
+        variate samples (None when no control variate is selected). With antithetic variates row i is
+        paired with row i + batch_size // 2, so batch_size should be even.
+        """
+        stochastic_process = self.get_stochastic_process(seed_sequence)
+        steps = self.get_steps()
+        horizon = steps * self.delta_t
+        # Processes without an exact transition still need the full path to reach S_T
+        sample_terminal = terminal_only and stochastic_process.has_exact_transition()
+
+        normals = None
+        if self.antithetic or self.control_variate is not None:
+            normals = stochastic_process.standard_normals(batch_size, 1 if sample_terminal else steps, self.antithetic)
+
+        if sample_terminal:
+            simulations = stochastic_process.simulate_terminal(batch_size, horizon, None if normals is None else normals[:, 0])
+            terminal_prices = simulations
+        else:
+            simulations = stochastic_process.simulate_paths(batch_size, steps, normals)
+            terminal_prices = simulations[:, -1]
+            if terminal_only:
+                simulations = terminal_prices
+
+        payoffs = self.discounted_payoffs(terminal_prices)
+        controls = None if self.control_variate is None else self.control_samples(terminal_prices, normals, horizon)
+
+        return simulations, payoffs, controls
+
+    def control_samples(self, terminal_prices, normals, horizon: float):
+        """
+        Discounted control variate samples for the call and put as a (n, 2) array.
+
+        "Terminal Price" uses S_T itself. "Black-Scholes" uses the call and put payoffs of a GBM path driven by
+        the same shocks, whose expectation is the analytic Black-Scholes price.
+        """
+        discount_factor = self.get_discount_factor()
+
+        if self.control_variate.upper() == "Terminal Price".upper():
+            return np.repeat(terminal_prices[:, None] * discount_factor, 2, axis=1)
 
-        with Pool(processes=processes) as pool:
-            results = pool.map(self.run_simulation_batch, batches)
+        brownian_terminal = normals.sum(axis=1) * math.sqrt(horizon / normals.shape[1])
+        gbm_terminal_prices = self.initial_price * np.exp(
+            (self.drift - 0.5 * self.volatility**2) * horizon + self.volatility * brownian_terminal
+        )
 
-        all_simulations = [sim for sublist in results for sim in sublist]
+        return self.discounted_payoffs(gbm_terminal_prices)
+
+    def control_means(self, horizon: float):
+        """Known expectation of the discounted control variate samples for the call and put."""
+        discount_factor = self.get_discount_factor()
+
+        if self.control_variate.upper() == "Terminal Price".upper():
+            stochastic_process = Stochastic_Process(self.stochastic_process_type, self.initial_price, self.drift,
+                                                    self.delta_t, self.volatility, **self.process_parameters)
+            expected_price = stochastic_process.expected_terminal_price(horizon)
+            return np.array([expected_price, expected_price]) * discount_factor
+
+        # E[max(S_T - K, 0)] for a GBM with drift mu is exp(mu T) times the Black-Scholes price with r = mu
+        growth = math.exp(self.drift * horizon)
+        return np.array([
+            black_scholes_price(self.initial_price, self.strike.Strike, horizon, self.drift, self.volatility, "call"),
+            black_scholes_price(self.initial_price, self.strike.Strike, horizon, self.drift, self.volatility, "put")
+        ]) * growth * discount_factor
+
+    @staticmethod
+    def control_beta(payoffs, controls):
+        """Variance-minimising control variate coefficient for each column."""
+        control_deviation = controls - controls.mean(axis=0)
+        control_variance = (control_deviation**2).sum(axis=0)
+        covariance = (control_deviation * (payoffs - payoffs.mean(axis=0))).sum(axis=0)
+
+        return np.divide(covariance, control_variance, out=np.zeros_like(covariance), where=control_variance > 0)
+
+    @staticmethod
+    def summarise_samples(payoffs, controls=None):
+        """Sums needed to combine batches into a (control variate) price estimate."""
+        summary = {"count": len(payoffs), "payoffs": payoffs.sum(axis=0)}
+
+        if controls is not None:
+            summary["controls"] = controls.sum(axis=0)
+            summary["controls squared"] = (controls**2).sum(axis=0)
+            summary["cross"] = (controls * payoffs).sum(axis=0)
+
+        return summary
+
+    def estimate_from_summaries(self, summaries: list):
+        """Combines batch summaries into the call and put price estimates."""
+        count = sum(summary["count"] for summary in summaries)
+        payoff_mean = sum(summary["payoffs"] for summary in summaries) / count
+
+        if self.control_variate is not None:
+            control_mean = sum(summary["controls"] for summary in summaries) / count
+            control_variance = sum(summary["controls squared"] for summary in summaries) / count - control_mean**2
+            covariance = sum(summary["cross"] for summary in summaries) / count - control_mean * payoff_mean
+            beta = np.divide(covariance, control_variance, out=np.zeros_like(covariance), where=control_variance > 0)
+            payoff_mean = payoff_mean - beta * (control_mean - self.control_means(self.get_steps() * self.delta_t))
+
+        return payoff_mean[0], payoff_mean[1]
+
+    def price_terminal_prices(self, terminal_prices):
+        """Discounts the average call and put payoffs over an array of terminal prices."""
+        call_price, put_price = np.average(self.discounted_payoffs(terminal_prices), axis=0)
+
+        return call_price, put_price
+
+    def run_adaptive(self, target_std_error: float = None, time_budget: float = None, chunk_size: int = 2000,
+                     max_sims: int = 1_000_000, confidence: float = 0.95, min_replicates: int = 8):
+        """
+        Streams terminal prices in chunks and stops once the price is accurate enough.
+
+        The running mean and variance of the discounted payoffs are kept with a Welford accumulator,
+        so no payoffs are stored. Simulation stops at the first chunk where the standard error of both
+        the call and the put is at most target_std_error, the wall-clock time_budget (seconds) is spent,
+        or max_sims paths have been used. Without a target or budget it runs self.sims paths.
+
+        Antithetic pairs are averaged into one sample, and a control variate uses the coefficient
+        estimated on the first chunk for the rest of the run.
+
+        Sobol points are not independent, so their sample variance says nothing about the error of the
+        quasi-monte carlo mean. Each chunk is scrambled independently instead, and with the "Sobol" sampler
+        the standard error and (Student t) confidence interval come from the spread of the chunk means.
+        The target is only checked once min_replicates chunks have been run, as the spread of fewer is too noisy.
+
+        Returns
+        -------
+        dict
+            "call price", "put price", "call std error", "put std error", "call confidence interval",
+            "put confidence interval" (lower, upper), "simulations" used and "elapsed" seconds.
+        """
+        if target_std_error is None and time_budget is None:
+            max_sims = self.sims
+
+        accumulator = Welford_Accumulator(estimators=2)
+        # Chunk means of independently scrambled Sobol replicates, the error estimate for quasi-monte carlo
+        replicates = Welford_Accumulator(estimators=2) if self.sampler.upper() == "Sobol".upper() else None
+        error_accumulator = accumulator if replicates is None else replicates
+        paths_per_sample = 2 if self.antithetic else 1
+        beta, control_mean = None, None
+        start_time = perf_counter()
+
+        while accumulator.count * paths_per_sample < max_sims:
+            chunk = min(chunk_size, max_sims - accumulator.count * paths_per_sample)
+            # Whole antithetic pairs only, rounded down so max_sims is never exceeded
+            chunk -= chunk % paths_per_sample
+            if chunk == 0:
+                break
+            _, samples, controls = self.simulate_batch(chunk, terminal_only=True)
+
+            if self.antithetic:
+                samples = (samples[:chunk // 2] + samples[chunk // 2:]) / 2
+                controls = None if controls is None else (controls[:chunk // 2] + controls[chunk // 2:]) / 2
+
+            if controls is not None:
+                if beta is None:
+                    beta = self.control_beta(samples, controls)
+                    control_mean = self.control_means(self.get_steps() * self.delta_t)
+                samples = samples - beta * (controls - control_mean)
+
+            accumulator.update(samples)
+            if replicates is not None:
+                replicates.update(samples.mean(axis=0, keepdims=True))
+
+            enough_replicates = replicates is None or replicates.count >= min_replicates
+            if target_std_error is not None and enough_replicates and \
+                    np.all(error_accumulator.std_error() <= target_std_error):
+                break
+            if time_budget is not None and perf_counter() - start_time >= time_budget:
+                break
+
+        std_error = error_accumulator.std_error()
+        if replicates is None:
+            lower, upper = accumulator.confidence_interval(confidence)
+        else:
+            half_width = si.t.ppf(0.5 + confidence / 2, max(replicates.count - 1, 1)) * std_error
+            lower, upper = accumulator.mean - half_width, accumulator.mean + half_width
+
+        return {
+            "call price": accumulator.mean[0],
+            "put price": accumulator.mean[1],
+            "call std error": std_error[0],
+            "put std error": std_error[1],
+            "call confidence interval": (lower[0], upper[0]),
+            "put confidence interval": (lower[1], upper[1]),
+            "simulations": accumulator.count * paths_per_sample,
+            "elapsed": perf_counter() - start_time
+        }
+
+    def get_batch_parameters(self):
+        """
+        Plain values simulate_batch depends on, sent to pool workers instead of the whole simulation.
+
+        The rate curve is reduced to its average rate, which is all the discount factor to tte uses.
+        """
+        return {
+            "stochastic_process_type": self.stochastic_process_type,
+            "strike": self.strike.Strike,
+            "initial_price": self.initial_price,
+            "drift": self.drift,
+            "delta_t": self.delta_t,
+            "volatility": self.volatility,
+            "tte": self.tte,
+            "rfr": float(np.average(self.rfr_range['Rate'])),
+            "antithetic": self.antithetic,
+            "control_variate": self.control_variate,
+            "sampler": self.sampler,
+            "process_parameters": dict(self.process_parameters)
+        }
+
+    @classmethod
+    def from_batch_parameters(cls, parameters: dict):
+        """Rebuilds a simulation that gives the same simulate_batch results from get_batch_parameters()."""
+        parameters = dict(parameters)
+        rfr = parameters.pop("rfr")
+
+        return cls(strike=Strike(parameters.pop("strike")), sims=0, rfr_appropriate_dates=pd.DataFrame({'Rate': [rfr]}),
+                   **parameters)
+
+    def run_multiprocessing(self, processes: int, terminal_only: bool = False):
+        """
+        Runs the simulation across a pool of processes and prices the call and put.
+
+        When terminal_only is True only S_T is sampled (exactly for GBM and ABM) and the returned
+        simulations are a 1-D array of terminal prices rather than the full (sims, steps + 1) paths.
+
+        The workers belong to a persistent pool shared between calls. They write their paths straight
+        into a shared memory buffer and only send back payoff (and control variate) sums.
+        """
+        all_simulations, summaries = get_simulation_pool(processes).run(
+            self.get_batch_parameters(), self.sims, self.get_steps(), terminal_only, self.seed_sequence.spawn(1)[0]
+        )
 
-        # Compute Call & Put Payoffs
         # Following print is for DEBUGGING
-        # print([result[-1] for result in all_simulations][:30])
-        payoffs_call = [max(sim[-1] - self.strike.Strike, 0) for sim in all_simulations]  # Call: max(S_T - K, 0)
-        payoffs_put = [max(self.strike.Strike - sim[-1], 0) for sim in all_simulations]  # Put: max(K - S_T, 0)
+        # print(all_simulations[:30])
 
         # Compute present value of both option prices
-        discount_factor = math.exp(-self.tte * np.average(self.rfr_range['Rate']))
-        call_price = np.average(payoffs_call) * discount_factor
-        put_price = np.average(payoffs_put) * discount_factor
+        call_price, put_price = self.estimate_from_summaries(summaries)
 
         return call_price, put_price, all_simulations
 
@@ -0,0 +1,126 @@
+from .utils import *
+from .option_strike import Strike
+from .euro_option_simulation import European_Option_Simulation
+from .monte_carlo_accumulator import Welford_Accumulator
+from .path_accumulator import Path_Accumulator
+from .constants import exotic_options
+
+class Exotic_Option_Simulation(European_Option_Simulation):
+    """Prices Asian, barrier and lookback options from paths streamed block by block, never storing the path matrix."""
+
+    # up_barrier = Barrier above the initial price for the Up-and-Out/Up-and-In options (None skips them)
+    # down_barrier = Barrier below the initial price for the Down-and-Out/Down-and-In options (None skips them)
+    # batch_size = Number of paths simulated together, block_steps = Number of time steps held in memory per block
+    def __init__(self, stochastic_process_type: str, strike: Strike, sims: int, initial_price: float, drift: float, \
+                 delta_t: float, volatility: float, tte: float, rfr_appropriate_dates, seed: int = None, \
+                 antithetic: bool = False, sampler: str = "Pseudo-Random", up_barrier: float = None, \
+                 down_barrier: float = None, batch_size: int = 10000, block_steps: int = 64, process_parameters: dict = None):
+        super().__init__(stochastic_process_type, strike, sims, initial_price, drift, delta_t, volatility, tte,
+                         rfr_appropriate_dates, seed=seed, antithetic=antithetic, sampler=sampler,
+                         process_parameters=process_parameters)
+        # A barrier on the wrong side of the initial price is hit at time 0, making its options meaningless
+        if up_barrier is not None and up_barrier <= initial_price:
+            raise ValueError(f"The up barrier ({up_barrier}) must be above the initial price ({initial_price})")
+        if down_barrier is not None and down_barrier >= initial_price:
+            raise ValueError(f"The down barrier ({down_barrier}) must be below the initial price ({initial_price})")
+
+        self.barriers = {"Up": up_barrier, "Down": down_barrier}
+        self.batch_size = batch_size
+        self.block_steps = block_steps
+
+    def get_option_names(self):
+        """Options priced by run_exotics, in the order of exotic_options."""
+        return [name for name in exotic_options if "-and-" not in name or self.barriers[name.split("-")[0]] is not None]
+
+    def run_path_accumulator(self, batch_size: int, seed_sequence: np.random.SeedSequence = None, antithetic: bool = None):
+        """
+        Streams a batch of paths through a Path_Accumulator one block of time steps at a time.
+
+        :param antithetic: Override self.antithetic for this batch
+        """
+        antithetic = self.antithetic if antithetic is None else antithetic
+        stochastic_process = self.get_stochastic_process(seed_sequence)
+        accumulator = Path_Accumulator(np.full(batch_size, float(self.initial_price)))
+
+        for block in stochastic_process.simulate_path_blocks(batch_size, self.get_steps(), self.block_steps, antithetic):
+            accumulator.update(block)
+
+        return accumulator
+
+    def exotic_payoffs(self, accumulator: Path_Accumulator):
+        """
+        Undiscounted call and put payoffs of every option in get_option_names().
+
+        :return: Array of shape (sims, 2 * len(get_option_names())) with the call and put of each option side by side
+        """
+        K = self.strike.Strike
+        payoffs = {
+            "Asian Arithmetic": accumulator.arithmetic_average() - K,
+            "Asian Geometric": accumulator.geometric_average() - K,
+            "Lookback Fixed Strike": (accumulator.maximum - K, K - accumulator.minimum),
+            "Lookback Floating Strike": (accumulator.last - accumulator.minimum, accumulator.maximum - accumulator.last)
+        }
+
+        vanilla = accumulator.last - K
+        for direction, barrier in self.barriers.items():
+            if barrier is not None:
+                hit = accumulator.barrier_hit(barrier, direction)
+                payoffs[f"{direction}-and-Out"] = np.where(hit, 0.0, vanilla), np.where(hit, 0.0, -vanilla)
+                payoffs[f"{direction}-and-In"] = np.where(hit, vanilla, 0.0), np.where(hit, -vanilla, 0.0)
+
+        columns = []
+        for name in self.get_option_names():
+            # A single array is S - K for the call, the put is its negation
+            call, put = payoffs[name] if isinstance(payoffs[name], tuple) else (payoffs[name], -payoffs[name])
+            columns += [np.maximum(call, 0), np.maximum(put, 0)]
+
+        return np.column_stack(columns)
+
+    def run_exotics(self, seed_sequence: np.random.SeedSequence = None):
+        """
+        Prices every option in get_option_names() from the same self.sims paths.
+
+        Paths are simulated batch_size at a time and each batch is streamed through a Path_Accumulator
+        in blocks of block_steps, so memory depends on batch_size * block_steps rather than on
+        sims * steps. The discounted payoffs of each batch are merged into a Welford accumulator.
+
+        Returns
+        -------
+        dict
+            For each option name: {"call price", "put price", "call std error", "put std error"}
+        """
+        if seed_sequence is None:
+            seed_sequence = self.seed_sequence.spawn(1)[0]
+
+        names = self.get_option_names()
+        payoff_accumulator = Welford_Accumulator(estimators=2 * len(names))
+        discount_factor = self.get_discount_factor()
+
+        remaining = self.sims
+        while remaining > 0:
+            batch = min(self.batch_size, remaining)
+            # Antithetic batches are rounded down to whole pairs so no more than sims paths are simulated,
+            # an odd last path is drawn on its own
+            antithetic = self.antithetic and batch > 1
+            if antithetic:
+                batch -= batch % 2
+            accumulator = self.run_path_accumulator(batch, seed_sequence.spawn(1)[0], antithetic)
+            samples = discount_factor * self.exotic_payoffs(accumulator)
+
+            if antithetic:
+                samples = (samples[:batch // 2] + samples[batch // 2:]) / 2
+
+            payoff_accumulator.update(samples)
+            remaining -= batch
+
+        std_error = payoff_accumulator.std_error()
+
+        return {
+            name: {
+                "call price": payoff_accumulator.mean[2 * i],
+                "put price": payoff_accumulator.mean[2 * i + 1],
+                "call std error": std_error[2 * i],
+                "put std error": std_error[2 * i + 1]
+            }
+            for i, name in enumerate(names)
+        }
@@ -0,0 +1,116 @@
+from .utils import np, math
+from .constants import lattice_types
+
+class Lattice_Pricer:
+    """Prices European and American options on CRR binomial or trinomial trees, for many strikes at once."""
+
+    # tte = Time to Expiration (years), rfr = Risk Free Rate
+    # steps = Number of time steps in the tree, lattice = "Binomial" (Cox-Ross-Rubinstein) or "Trinomial"
+    def __init__(self, tte: float, rfr: float, volatility: float, steps: int = 500, lattice: str = "Binomial"):
+        if lattice.upper() not in [l.upper() for l in lattice_types]:
+            raise ValueError(f"Unknown lattice: {lattice}. Use one of {lattice_types}")
+
+        self.tte = tte
+        self.rfr = rfr
+        self.volatility = volatility
+        self.steps = steps
+        self.lattice = lattice
+
+    def is_binomial(self):
+        return self.lattice.upper() == "Binomial".upper()
+
+    def tree_parameters(self):
+        """Up move factor, branch probabilities (highest move first) and one step discount factor."""
+        dt = self.tte / self.steps
+        discount = math.exp(-self.rfr * dt)
+
+        if self.is_binomial():
+            up = math.exp(self.volatility * math.sqrt(dt))
+            p_up = (math.exp(self.rfr * dt) - 1 / up) / (up - 1 / up)
+            return up, (p_up, 1 - p_up), discount
+
+        # Boyle trinomial tree with log-price moves of sigma sqrt(2 dt)
+        up = math.exp(self.volatility * math.sqrt(2 * dt))
+        half_up = math.exp(self.volatility * math.sqrt(dt / 2))
+        growth = math.exp(self.rfr * dt / 2)
+        p_up = ((growth - 1 / half_up) / (half_up - 1 / half_up))**2
+        p_down = ((half_up - growth) / (half_up - 1 / half_up))**2
+        return up, (p_up, 1 - p_up - p_down, p_down), discount
+
+    def step_prices(self, price_ladder, step: int):
+        """
+        Node prices of a time step, lowest first, as a view of price_ladder = spot * up ** (-steps, ..., steps).
+
+        Every node of the tree has the price spot * up^k for an integer k between -steps and steps, so each
+        step is a slice of the ladder: every other rung for the binomial tree, consecutive rungs for the trinomial.
+        """
+        if self.is_binomial():
+            return price_ladder[self.steps - step:self.steps + step + 1:2]
+        return price_ladder[self.steps - step:self.steps + step + 1]
+
+    def price(self, spot: float, strikes, option_type: str = "call", exercise_style: str = "European"):
+        """
+        Backward induction through the tree for every strike at once.
+
+        The option values of one time step are held as a (nodes, strikes) array and each step back is
+        a weighted sum of shifted slices of it, so the only Python loop is over the time steps. The
+        tree shrinks in place inside preallocated buffers and the node prices of every step are views of
+        one price ladder, so no arrays are allocated per step.
+
+        Parameters
+        ----------
+        spot : float
+            Current price of the underlying.
+        strikes : float or array-like
+            One or more strike prices.
+        option_type : str, optional
+            "call" or "put" (default: "call").
+        exercise_style : str, optional
+            "European" or "American" (default: "European").
+
+        Returns
+        -------
+        NDArray
+            Option price for each strike (same shape as strikes).
+        """
+        strikes = np.asarray(strikes, dtype=float)
+        if option_type.lower() == "call":
+            sign = 1.0
+        elif option_type.lower() == "put":
+            sign = -1.0
+        else:
+            raise ValueError("Invalid option type. Use 'call' or 'put'.")
+        american = exercise_style.upper() == "American".upper()
+
+        up, probabilities, discount = self.tree_parameters()
+        weights = [discount * probability for probability in probabilities]
+        flat_strikes = strikes.ravel()[None, :]
+
+        price_ladder = spot * up ** np.arange(-self.steps, self.steps + 1, dtype=float)
+        values = np.maximum(sign * (self.step_prices(price_ladder, self.steps)[:, None] - flat_strikes), 0)
+        scratch = np.empty_like(values)
+        middle_scratch = np.empty_like(values) if not self.is_binomial() else None
+
+        for step in range(self.steps - 1, -1, -1):
+            # New node k combines old nodes k (lowest branch) up to k + 1 (binomial) or k + 2 (trinomial)
+            nodes = step + 1 if self.is_binomial() else 2 * step + 1
+            new_values = values[:nodes]
+
+            if self.is_binomial():
+                np.multiply(values[1:nodes + 1], weights[0], out=scratch[:nodes])
+                new_values *= weights[1]
+                new_values += scratch[:nodes]
+            else:
+                # Both shifted slices are read before new_values overwrites the nodes they share
+                np.multiply(values[2:nodes + 2], weights[0], out=scratch[:nodes])
+                np.multiply(values[1:nodes + 1], weights[1], out=middle_scratch[:nodes])
+                new_values *= weights[2]
+                new_values += scratch[:nodes]
+                new_values += middle_scratch[:nodes]
+
+            if american:
+                np.subtract(self.step_prices(price_ladder, step)[:, None], flat_strikes, out=scratch[:nodes])
+                scratch[:nodes] *= sign
+                np.maximum(new_values, scratch[:nodes], out=new_values)
+
+        return values[0].reshape(strikes.shape)
@@ -0,0 +1,102 @@
+from .utils import *
+from .constants import market_data_dir
+from abc import ABC, abstractmethod
+
+def to_field_ticker_columns(data: pd.DataFrame, tickers: list):
+    """
+    Puts a price frame into the (field, ticker) column layout shared by every provider, with a tz-naive
+    "Date" index. A frame with flat columns is taken to hold the single ticker in tickers.
+    """
+    if not isinstance(data.columns, pd.MultiIndex):
+        data = data.copy()
+        data.columns = pd.MultiIndex.from_product([data.columns, tickers[:1]])
+    data.columns = data.columns.set_names(["Price", "Ticker"])
+
+    if isinstance(data.index, pd.DatetimeIndex) and data.index.tz is not None:
+        data.index = data.index.tz_localize(None)
+    data.index.name = "Date"
+
+    # Tickers the source had nothing for come back as all-NaN columns
+    return data.dropna(axis=1, how="all").sort_index()
+
+def split_by_ticker(data: pd.DataFrame):
+    """Splits a (field, ticker) frame into one flat-column frame per ticker, without its empty rows."""
+    if data.empty:
+        return {}
+    return {ticker: data.xs(ticker, axis=1, level="Ticker").dropna(how="all")
+            for ticker in data.columns.get_level_values("Ticker").unique()}
+
+class Market_Data_Provider(ABC):
+    """
+    Source of daily price history. Providers return one frame for all requested tickers, indexed by "Date"
+    and with (field, ticker) columns such as ("Close", "AAPL"); tickers without data are left out.
+    """
+
+    @abstractmethod
+    def get_history(self, tickers: list, start, end) -> pd.DataFrame:
+        """Daily OHLCV history of every ticker on [start, end) in a single aligned frame."""
+
+class Yahoo_Finance_Provider(Market_Data_Provider):
+    """Downloads from Yahoo Finance, many tickers per request instead of one download per ticker."""
+
+    def __init__(self, batch_size: int = 100, threads: bool = True):
+        """
+        :param batch_size: Number of tickers per yfinance.download call
+        :param threads: Let yfinance download the tickers of a batch concurrently
+        """
+        self.batch_size = batch_size
+        self.threads = threads
+
+    def get_history(self, tickers: list, start, end):
+        tickers = list(tickers)
+        frames = []
+        for i in range(0, len(tickers), self.batch_size):
+            batch = tickers[i:i + self.batch_size]
+            data = yf.download(batch, start=start, end=end, progress=False, auto_adjust=True,
+                               group_by="column", threads=self.threads)
+            if not data.empty:
+                frames.append(to_field_ticker_columns(data, batch))
+
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1).sort_index()
+
+class Local_Directory_Provider(Market_Data_Provider):
+    """
+    Reads price history from a directory of <ticker>.parquet or <ticker>.csv files (with a "Date" column),
+    for tests and runs without network access.
+    """
+
+    def __init__(self, directory: str = market_data_dir):
+        self.directory = directory
+
+    def read_ticker(self, ticker: str):
+        """Full price history of one ticker, or None when the directory has no file for it."""
+        path = os.path.join(self.directory, ticker)
+        if os.path.exists(path + ".parquet"):
+            data = pd.read_parquet(path + ".parquet")
+            if "Date" in data.columns:
+                data = data.set_index("Date")
+        elif os.path.exists(path + ".csv"):
+            data = pd.read_csv(path + ".csv", index_col="Date", parse_dates=True)
+        else:
+            return None
+
+        data.index = pd.to_datetime(data.index)
+        return data
+
+    def get_history(self, tickers: list, start, end):
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        frames = {}
+        for ticker in tickers:
+            data = self.read_ticker(ticker)
+            if data is None:
+                logging.warning(f"No price history file for {ticker} in {self.directory}")
+                continue
+            frames[ticker] = data[(data.index >= start) & (data.index < end)]
+
+        if not frames:
+            return pd.DataFrame()
+
+        data = pd.concat(frames, axis=1).swaplevel(axis=1)
+        return to_field_ticker_columns(data, list(frames))
@@ -0,0 +1,47 @@
+from .utils import np, norm
+
+class Welford_Accumulator:
+    """Running mean and variance of one or more Monte Carlo estimators, updated chunk by chunk."""
+
+    def __init__(self, estimators: int = 1):
+        """
+        :param estimators: Number of estimators tracked side by side (e.g. 2 for call and put)
+        """
+        self.count = 0
+        self.mean = np.zeros(estimators)
+        self.m2 = np.zeros(estimators)  # Sum of squared deviations from the running mean
+
+    def update(self, samples):
+        """
+        Merges a chunk of samples into the running statistics (Chan et al. parallel form of Welford).
+
+        :param samples: Array of shape (n,) or (n, estimators)
+        """
+        samples = np.asarray(samples, dtype=float).reshape(len(samples), -1)
+        chunk_count = samples.shape[0]
+        if chunk_count == 0:
+            return
+
+        chunk_mean = samples.mean(axis=0)
+        chunk_m2 = ((samples - chunk_mean)**2).sum(axis=0)
+
+        total = self.count + chunk_count
+        delta = chunk_mean - self.mean
+        self.mean = self.mean + delta * chunk_count / total
+        self.m2 = self.m2 + chunk_m2 + delta**2 * self.count * chunk_count / total
+        self.count = total
+
+    def variance(self):
+        """Unbiased sample variance of each estimator."""
+        if self.count < 2:
+            return np.full_like(self.mean, np.inf)
+        return self.m2 / (self.count - 1)
+
+    def std_error(self):
+        """Standard error of the running mean of each estimator."""
+        return np.sqrt(self.variance() / max(self.count, 1))
+
+    def confidence_interval(self, confidence: float = 0.95):
+        """Two-sided normal confidence interval of the running mean as (lower, upper) arrays."""
+        half_width = norm.ppf(0.5 + confidence / 2) * self.std_error()
+        return self.mean - half_width, self.mean + half_width
@@ -0,0 +1,175 @@
+from .utils import *
+from .monte_carlo_accumulator import Welford_Accumulator
+from .constants import multi_asset_options
+
+class Multi_Asset_Simulation:
+    """Simulates correlated geometric brownian motions for a basket of assets and prices multi-asset options."""
+
+    # tte = Time to Expiration
+    # weights = Units of each asset held in the basket (default one of each)
+    def __init__(self, initial_prices, drift: float, volatilities, correlation, delta_t: float, tte: float, \
+                 rfr_appropriate_dates, sims: int = 10000, seed: int = None, weights=None, batch_size: int = 10000):
+        self.initial_prices = np.asarray(initial_prices, dtype=float)
+        self.drift = drift
+        self.volatilities = np.broadcast_to(np.asarray(volatilities, dtype=float), self.initial_prices.shape)
+        self.correlation = np.asarray(correlation, dtype=float)
+        self.delta_t = delta_t
+        self.tte = tte
+        self.rfr_range = rfr_appropriate_dates
+        self.sims = sims
+        self.seed = seed
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.weights = np.ones_like(self.initial_prices) if weights is None else np.asarray(weights, dtype=float)
+        self.batch_size = batch_size
+
+        # Factor the correlation once, every simulation reuses it
+        self.correlation_factor = self.correlation_cholesky(self.correlation)
+
+    @classmethod
+    def from_price_history(cls, prices: pd.DataFrame, drift: float, delta_t: float, tte: float, rfr_appropriate_dates,
+                           periods_per_year: int = 252, **kwargs):
+        """
+        Builds the simulation from a price history with one column per asset (e.g. from get_multi_asset_stock_data).
+
+        The starting prices are the last row, and the volatilities and correlation are estimated from the log returns.
+        Rows are trading days, so the return volatilities are annualised with 252 periods per year by default.
+        """
+        log_returns = np.log(prices).diff().dropna()
+        volatilities = log_returns.std().to_numpy() * np.sqrt(periods_per_year)
+
+        return cls(prices.iloc[-1].to_numpy(), drift, volatilities, cls.estimate_correlation(prices), delta_t, tte,
+                   rfr_appropriate_dates, **kwargs)
+
+    @staticmethod
+    def estimate_correlation(prices: pd.DataFrame):
+        """Correlation matrix of the daily log returns of each column of prices."""
+        return np.log(prices).diff().dropna().corr().to_numpy()
+
+    @staticmethod
+    def correlation_cholesky(correlation, min_eigenvalue: float = 1e-8):
+        """
+        Lower triangular L with L L^T equal to the correlation matrix.
+
+        Correlations estimated from histories with gaps, or set by hand, are not always positive
+        semi-definite. In that case the eigenvalues are clipped at min_eigenvalue and the result is
+        rescaled back to a unit diagonal before factoring.
+        """
+        try:
+            return np.linalg.cholesky(correlation)
+        except np.linalg.LinAlgError:
+            logging.warning("Correlation matrix is not positive definite, clipping its eigenvalues")
+
+        eigenvalues, eigenvectors = np.linalg.eigh((correlation + correlation.T) / 2)
+        clipped = (eigenvectors * np.maximum(eigenvalues, min_eigenvalue)) @ eigenvectors.T
+        scale = 1 / np.sqrt(np.diag(clipped))
+
+        return np.linalg.cholesky(clipped * np.outer(scale, scale))
+
+    def get_steps(self):
+        """Number of delta_t time steps needed to reach expiry."""
+        return max(int(round(self.tte / self.delta_t)), 1)
+
+    def get_discount_factor(self):
+        """Discount factor to expiry using the average rate in rfr_range."""
+        return math.exp(-self.tte * np.average(self.rfr_range['Rate']))
+
+    def correlated_normals(self, rng: np.random.Generator, shape):
+        """Standard normals of shape (..., assets) whose last axis has the target correlation (one matmul)."""
+        return rng.standard_normal((*shape, len(self.initial_prices))) @ self.correlation_factor.T
+
+    def simulate_paths(self, sims: int, steps: int = None, seed_sequence: np.random.SeedSequence = None):
+        """
+        Simulates every asset of every path at once as a (sims, steps + 1, assets) tensor.
+
+        :param sims: Number of paths to simulate
+        :param steps: Number of time steps of size delta_t (default: up to expiry)
+        :param seed_sequence: Seed of the random stream (default: the next spawned stream)
+        """
+        steps = self.get_steps() if steps is None else steps
+        rng = np.random.default_rng(self.seed_sequence.spawn(1)[0] if seed_sequence is None else seed_sequence)
+
+        log_returns = self.correlated_normals(rng, (sims, steps)) * (self.volatilities * math.sqrt(self.delta_t))
+        log_returns += (self.drift - 0.5 * self.volatilities**2) * self.delta_t
+
+        paths = np.empty((sims, steps + 1, len(self.initial_prices)))
+        paths[:, 0] = 0.0
+        np.cumsum(log_returns, axis=1, out=paths[:, 1:])
+        np.exp(paths, out=paths)
+        paths *= self.initial_prices
+
+        return paths
+
+    def simulate_terminal(self, sims: int, seed_sequence: np.random.SeedSequence = None):
+        """Samples the (sims, assets) prices at expiry directly from the exact lognormal transition."""
+        rng = np.random.default_rng(self.seed_sequence.spawn(1)[0] if seed_sequence is None else seed_sequence)
+        horizon = self.get_steps() * self.delta_t
+
+        W = self.correlated_normals(rng, (sims,)) * (self.volatilities * math.sqrt(horizon))
+        return self.initial_prices * np.exp((self.drift - 0.5 * self.volatilities**2) * horizon + W)
+
+    def multi_asset_payoffs(self, terminal_prices, basket_strike: float, spread_strike: float = 0.0,
+                            performance_strike: float = 1.0):
+        """
+        Undiscounted call and put payoffs of every option in multi_asset_options.
+
+        Basket: weights . S_T against basket_strike. Spread: S_T of the first asset minus the second
+        against spread_strike. Best-of / Worst-of: best and worst performance S_T / S_0 against
+        performance_strike (1.0 is at the money).
+
+        :return: Array of shape (sims, 2 * len(multi_asset_options)) with the call and put of each option side by side
+        """
+        performance = terminal_prices / self.initial_prices
+        underlyings = {
+            "Basket": (terminal_prices @ self.weights, basket_strike),
+            "Spread": (terminal_prices[:, 0] - terminal_prices[:, 1], spread_strike),
+            "Best-of": (performance.max(axis=1), performance_strike),
+            "Worst-of": (performance.min(axis=1), performance_strike)
+        }
+
+        columns = []
+        for name in multi_asset_options:
+            underlying, strike = underlyings[name]
+            columns += [np.maximum(underlying - strike, 0), np.maximum(strike - underlying, 0)]
+
+        return np.column_stack(columns)
+
+    def price_multi_asset_options(self, basket_strike: float, spread_strike: float = 0.0, performance_strike: float = 1.0,
+                                  seed_sequence: np.random.SeedSequence = None):
+        """
+        Prices every option in multi_asset_options from the same self.sims correlated terminal prices.
+
+        The payoffs only depend on S_T, so terminal prices are sampled exactly in batches of batch_size
+        and merged into a Welford accumulator.
+
+        Returns
+        -------
+        dict
+            For each option name: {"call price", "put price", "call std error", "put std error"}
+        """
+        if len(self.initial_prices) < 2:
+            raise ValueError("Multi-asset options need at least two assets")
+        if seed_sequence is None:
+            seed_sequence = self.seed_sequence.spawn(1)[0]
+
+        accumulator = Welford_Accumulator(estimators=2 * len(multi_asset_options))
+        discount_factor = self.get_discount_factor()
+
+        remaining = self.sims
+        while remaining > 0:
+            batch = min(self.batch_size, remaining)
+            terminal_prices = self.simulate_terminal(batch, seed_sequence.spawn(1)[0])
+            accumulator.update(discount_factor * self.multi_asset_payoffs(terminal_prices, basket_strike,
+                                                                          spread_strike, performance_strike))
+            remaining -= batch
+
+        std_error = accumulator.std_error()
+
+        return {
+            name: {
+                "call price": accumulator.mean[2 * i],
+                "put price": accumulator.mean[2 * i + 1],
+                "call std error": std_error[2 * i],
+                "put std error": std_error[2 * i + 1]
+            }
+            for i, name in enumerate(multi_asset_options)
+        }
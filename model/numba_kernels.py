@@ -0,0 +1,100 @@
+from .utils import np, math
+
+# Numba is optional: without it the kernels below are never called and Stochastic_Process and
+# Path_Accumulator keep using their NumPy implementations
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that leaves the function as plain Python."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
+@njit(parallel=True, cache=True)
+def interpolate_rows_kernel(x, xp, fp, out):
+    """
+    Row-wise np.interp with one thread per block of rows, written into out.
+
+    :param x: (n,) increasing points to evaluate, shared by all rows
+    :param xp: (sims, m) increasing sample points per row
+    :param fp: (sims, m) sample values per row
+    :param out: (sims, n) output array
+    """
+    sims, m = xp.shape
+    for row in prange(sims):
+        # x is increasing, so one forward sweep over xp finds every bracket
+        upper = 0
+        for j in range(x.shape[0]):
+            while upper < m and xp[row, upper] <= x[j]:
+                upper += 1
+            if upper == 0:
+                out[row, j] = fp[row, 0]
+            elif upper == m:
+                out[row, j] = fp[row, m - 1]
+            else:
+                span = xp[row, upper] - xp[row, upper - 1]
+                weight = (x[j] - xp[row, upper - 1]) / span if span > 0 else 0.0
+                out[row, j] = fp[row, upper - 1] + weight * (fp[row, upper] - fp[row, upper - 1])
+
+@njit(parallel=True, cache=True)
+def heston_log_paths_kernel(drift, delta_t, mean_reversion, long_run_variance, initial_variance,
+                            price_shocks, variance_shocks, log_paths, block_size=1024):
+    """
+    Full truncation Euler Heston log-price paths, written into log_paths.
+
+    Paths are split into blocks run in parallel. Inside a block the time steps run in order and the
+    innermost loop sweeps the contiguous paths of the block, which the compiler vectorises.
+
+    :param price_shocks: (steps, sims) price Brownian increments sqrt(dt) Z_S
+    :param variance_shocks: (steps, sims) variance Brownian increments already scaled by vol_of_vol and correlated
+                            with the price shocks
+    :param log_paths: (steps + 1, sims) output array of log(S_t / S_0)
+    """
+    steps, sims = price_shocks.shape
+    blocks = (sims + block_size - 1) // block_size
+
+    for block in prange(blocks):
+        start = block * block_size
+        end = min(start + block_size, sims)
+        variance = np.full(end - start, initial_variance)
+        log_paths[0, start:end] = 0.0
+
+        for step in range(steps):
+            for path in range(start, end):
+                truncated_variance = max(variance[path - start], 0.0)
+                volatility = math.sqrt(truncated_variance)
+                log_paths[step + 1, path] = log_paths[step, path] + (drift - 0.5 * truncated_variance) * delta_t \
+                    + volatility * price_shocks[step, path]
+                variance[path - start] += mean_reversion * (long_run_variance - truncated_variance) * delta_t \
+                    + volatility * variance_shocks[step, path]
+
+@njit(parallel=True, cache=True)
+def accumulate_block_kernel(block, total, log_total, minimum, maximum):
+    """
+    Folds a (sims, n) block into the running sum, log sum, minimum and maximum of each path in a single pass.
+
+    Barrier monitoring only needs the running extremes, so every statistic is updated while the
+    block is read once instead of once per NumPy reduction.
+    """
+    sims, n = block.shape
+    for path in prange(sims):
+        path_total = 0.0
+        path_log_total = 0.0
+        path_minimum = minimum[path]
+        path_maximum = maximum[path]
+        for step in range(n):
+            price = block[path, step]
+            path_total += price
+            # Same as np.log: -inf at zero and NaN for the negative prices ABM can produce
+            path_log_total += math.log(price) if price > 0 else (-np.inf if price == 0 else np.nan)
+            path_minimum = min(path_minimum, price)
+            path_maximum = max(path_maximum, price)
+        total[path] += path_total
+        log_total[path] += path_log_total
+        minimum[path] = path_minimum
+        maximum[path] = path_maximum
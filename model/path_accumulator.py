@@ -0,0 +1,64 @@
+from .utils import np
+from .numba_kernels import NUMBA_AVAILABLE, accumulate_block_kernel
+
+class Path_Accumulator:
+    """Running sum, log sum, minimum, maximum and last price of every path, updated one block of time steps at a time."""
+
+    def __init__(self, initial_prices):
+        """
+        :param initial_prices: (sims,) price of each path at time 0, which seeds the running minimum and maximum
+        """
+        initial_prices = np.asarray(initial_prices, dtype=float)
+        self.count = 0  # Number of monitoring dates seen so far (time 0 is not a monitoring date)
+        self.total = np.zeros_like(initial_prices)
+        self.log_total = np.zeros_like(initial_prices)
+        self.minimum = initial_prices.copy()
+        self.maximum = initial_prices.copy()
+        self.last = initial_prices.copy()
+
+    def update(self, block):
+        """
+        Folds the next block of prices into the running statistics.
+
+        :param block: (sims, n) prices at the next n monitoring dates
+        """
+        if block.shape[1] == 0:
+            return
+
+        self.count += block.shape[1]
+        self.last = block[:, -1].copy()
+
+        # Compiled kernel: every statistic in one pass over the block
+        if NUMBA_AVAILABLE:
+            accumulate_block_kernel(np.ascontiguousarray(block, dtype=float), self.total, self.log_total,
+                                    self.minimum, self.maximum)
+            return
+
+        self.total += block.sum(axis=1)
+        # ABM prices can go negative, their geometric average is left undefined (NaN)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.log_total += np.log(block).sum(axis=1)
+        np.minimum(self.minimum, block.min(axis=1), out=self.minimum)
+        np.maximum(self.maximum, block.max(axis=1), out=self.maximum)
+
+    def arithmetic_average(self):
+        """Arithmetic average price over the monitoring dates."""
+        return self.total / max(self.count, 1)
+
+    def geometric_average(self):
+        """Geometric average price over the monitoring dates."""
+        return np.exp(self.log_total / max(self.count, 1))
+
+    def barrier_hit(self, barrier: float, direction: str):
+        """
+        Whether each path touched the barrier on a monitoring date (or started beyond it).
+
+        :param barrier: Barrier level
+        :param direction: "Up" (hit when the price reaches the barrier from below) or "Down"
+        """
+        if direction.upper() == "Up".upper():
+            return self.maximum >= barrier
+        elif direction.upper() == "Down".upper():
+            return self.minimum <= barrier
+
+        raise ValueError(f"Unknown barrier direction: {direction}")
@@ -0,0 +1,190 @@
+from .utils import *
+from .constants import price_history_cache_dir
+from .market_data_provider import Market_Data_Provider, Yahoo_Finance_Provider, split_by_ticker
+import json
+import tempfile
+
+class Price_History_Cache:
+    """On-disk Parquet cache of daily price history per ticker that only downloads the dates it does not hold yet."""
+
+    def __init__(self, cache_dir: str = price_history_cache_dir, provider: Market_Data_Provider = None, offline: bool = False,
+                 settlement_days: int = 7):
+        """
+        :param cache_dir: Directory holding one <ticker>.parquet file and one <ticker>.coverage.json file per ticker
+        :param provider: Market_Data_Provider used to fill missing date ranges (default: Yahoo Finance)
+        :param offline: Never call the provider and serve whatever is on disk
+        :param settlement_days: Age in days after which a date range's prices are final, empty or not
+        """
+        self.cache_dir = cache_dir
+        self.provider = provider if provider is not None else Yahoo_Finance_Provider()
+        self.offline = offline
+        self.settlement_days = settlement_days
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def get_paths(self, ticker: str):
+        """Parquet data file and JSON coverage file of a ticker."""
+        name = "".join(character if character.isalnum() or character in "-_." else "_" for character in ticker)
+        return os.path.join(self.cache_dir, f"{name}.parquet"), os.path.join(self.cache_dir, f"{name}.coverage.json")
+
+    def load(self, ticker: str):
+        """Cached prices and the list of (start, end) date ranges already fetched (end exclusive)."""
+        data_path, coverage_path = self.get_paths(ticker)
+        if not (os.path.exists(data_path) and os.path.exists(coverage_path)):
+            return pd.DataFrame(), []
+
+        with open(coverage_path) as coverage_file:
+            coverage = [(pd.Timestamp(start), pd.Timestamp(end)) for start, end in json.load(coverage_file)]
+
+        return pd.read_parquet(data_path), coverage
+
+    def save(self, ticker: str, data: pd.DataFrame, coverage: list):
+        """
+        Writes through uniquely named temporary files, so a crash never leaves a half-written cache entry and
+        processes saving the same ticker at once never write into each other's files.
+        """
+        data_path, coverage_path = self.get_paths(ticker)
+
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(file_descriptor)
+        data.to_parquet(temporary_path)
+        os.replace(temporary_path, data_path)
+
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(file_descriptor, "w") as coverage_file:
+            json.dump([[start.isoformat(), end.isoformat()] for start, end in coverage], coverage_file)
+        os.replace(temporary_path, coverage_path)
+
+    @staticmethod
+    def merge_ranges(ranges: list):
+        """Sorted union of (start, end) ranges with overlapping or touching ranges joined."""
+        merged = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    @staticmethod
+    def missing_ranges(coverage: list, start: pd.Timestamp, end: pd.Timestamp):
+        """Parts of [start, end) not inside any of the (merged) coverage ranges."""
+        gaps = []
+        cursor = start
+        for covered_start, covered_end in coverage:
+            if covered_end <= cursor:
+                continue
+            if covered_start >= end:
+                break
+            if covered_start > cursor:
+                gaps.append((cursor, covered_start))
+            cursor = max(cursor, covered_end)
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def get_histories(self, tickers: list, start, end, offline: bool = None):
+        """
+        Daily price history of several tickers on [start, end) as one (field, ticker) column frame.
+
+        Tickers missing the same date range are downloaded together in one provider call, so a universe
+        refreshed up to the same day costs one batched request per missing range rather than one per ticker.
+
+        Ranges that come back empty are still recorded as fetched when they end before the ticker's first
+        price (not listed yet), end more than settlement_days ago, or span at most a week (weekends, holidays).
+        A long empty range reaching into the last settlement_days is more likely a failed download and is
+        fetched again. Today and later dates are never recorded, so the current day's prices are refreshed
+        on the next request.
+
+        :param offline: Override the cache's offline setting for this call
+        """
+        offline = self.offline if offline is None else offline
+        start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+        today = pd.Timestamp.today().normalize()
+        tickers = list(dict.fromkeys(tickers))
+
+        with self.lock:
+            cached = {ticker: self.load(ticker) for ticker in tickers}
+
+            # Group the tickers by the exact set of date ranges they are missing
+            gap_groups = {}
+            for ticker, (_, coverage) in cached.items():
+                gaps = tuple(self.missing_ranges(coverage, start, end))
+                if gaps:
+                    gap_groups.setdefault(gaps, []).append(ticker)
+
+            if gap_groups and offline:
+                missing = sum(len(group) for group in gap_groups.values())
+                logging.warning(f"Offline: {missing} ticker(s) are missing prices between {start.date()} and {end.date()}")
+            elif gap_groups:
+                fetched = {ticker: [] for group in gap_groups.values() for ticker in group}  # (start, end, data) per gap
+                for gaps, group in gap_groups.items():
+                    for gap_start, gap_end in gaps:
+                        logging.info(f"Downloading {len(group)} ticker(s) from {gap_start.date()} to {gap_end.date()}")
+                        try:
+                            gap_data = split_by_ticker(self.provider.get_history(group, gap_start, gap_end))
+                        except Exception as error:
+                            logging.warning(f"Could not download prices for {', '.join(group)}: {error}")
+                            continue
+
+                        for ticker in group:
+                            fetched[ticker].append((gap_start, gap_end, gap_data.get(ticker, pd.DataFrame())))
+
+                settled = today - pd.Timedelta(days=self.settlement_days)
+                for ticker, gap_results in fetched.items():
+                    data, coverage = cached[ticker]
+                    frames = [frame for _, _, frame in gap_results if not frame.empty]
+                    if frames:
+                        data = pd.concat([data] + frames) if not data.empty else pd.concat(frames)
+                        data = data[~data.index.duplicated(keep="last")].sort_index()
+
+                    first_date = data.index.min() if not data.empty else None
+                    for gap_start, gap_end, frame in gap_results:
+                        if not frame.empty or gap_end <= settled or (gap_end - gap_start).days <= 7 or \
+                                (first_date is not None and gap_end <= first_date):
+                            coverage.append((gap_start, min(gap_end, today)))
+                    coverage = self.merge_ranges([(s, e) for s, e in coverage if e > s])
+                    cached[ticker] = (data, coverage)
+                    if not data.empty:
+                        self.save(ticker, data, coverage)
+
+        frames = {ticker: data[(data.index >= start) & (data.index < end)]
+                  for ticker, (data, _) in cached.items() if not data.empty}
+        if not frames:
+            return pd.DataFrame()
+
+        data = pd.concat(frames, axis=1).swaplevel(axis=1).sort_index()
+        data.columns = data.columns.set_names(["Price", "Ticker"])
+        return data
+
+    def get_history(self, ticker: str, start, end, offline: bool = None):
+        """Daily price history of one ticker on [start, end) with flat columns, see get_histories."""
+        data = split_by_ticker(self.get_histories([ticker], start, end, offline=offline))
+        if ticker not in data:
+            raise ValueError(f"No data found for ticker: {ticker}")
+
+        return data[ticker]
+
+# The app shares one cache so concurrent reruns serialise their writes
+_price_history_cache = None
+_price_history_cache_lock = threading.Lock()
+
+def get_price_history_cache():
+    """Returns the shared Price_History_Cache, creating it on first use."""
+    global _price_history_cache
+    if _price_history_cache is None:
+        # Checked again under the lock so two threads arriving together still share one cache
+        with _price_history_cache_lock:
+            if _price_history_cache is None:
+                _price_history_cache = Price_History_Cache()
+
+    return _price_history_cache
+
+def set_market_data_provider(provider: Market_Data_Provider, offline: bool = False):
+    """Points the shared cache at another provider, e.g. a Local_Directory_Provider for air-gapped runs."""
+    cache = get_price_history_cache()
+    with cache.lock:
+        cache.provider = provider
+        cache.offline = offline
+
+    return cache
@@ -0,0 +1,137 @@
+from .utils import *
+from .constants import rate_store_dir, rfr_datasets_mapping
+import json
+import tempfile
+
+class Rate_Dataset_Store:
+    """
+    Binary copies of the bundled rate CSVs, one datetime64[D] date array and one float64 rate array per
+    dataset saved as .npy files and memory-mapped read-only on load.
+
+    The arrays are built from the CSV on first use and rebuilt whenever the CSV's modified time or size
+    changes. Mapped pages live in the OS page cache, so worker processes loading the same dataset share
+    them instead of each parsing the CSV.
+    """
+
+    def __init__(self, store_dir: str = rate_store_dir):
+        self.store_dir = store_dir
+        self.loaded = {}  # csv path -> (source signature, dates, rates)
+        self.lock = threading.Lock()
+        os.makedirs(store_dir, exist_ok=True)
+
+    def get_paths(self, csv_path: str):
+        """Date array, rate array and metadata files of a CSV."""
+        name = os.path.splitext(os.path.basename(csv_path))[0]
+        base = os.path.join(self.store_dir, name)
+        return base + ".dates.npy", base + ".rates.npy", base + ".meta.json"
+
+    @staticmethod
+    def source_signature(csv_path: str):
+        stat = os.stat(csv_path)
+        return [stat.st_mtime_ns, stat.st_size]
+
+    @staticmethod
+    def parse_csv(csv_path: str):
+        """Sorted dates and non-zero rates of a "ds,y" CSV with D/MM/YYYY dates."""
+        df = pd.read_csv(csv_path)
+        try:
+            # An explicit format parses vectorised, dayfirst=True falls back to inferring each row
+            dates = pd.to_datetime(df['ds'], format="%d/%m/%Y")
+        except ValueError:
+            dates = pd.to_datetime(df['ds'], dayfirst=True)
+
+        # Zero rates are missing observations in the bundled datasets
+        keep = (df['y'] != 0).to_numpy()
+        dates = dates.to_numpy()[keep].astype("datetime64[D]")
+        rates = df['y'].to_numpy(dtype=np.float64)[keep]
+
+        order = np.argsort(dates, kind="stable")
+        return dates[order], rates[order]
+
+    def build(self, csv_path: str):
+        """
+        Converts a CSV into the binary store, writing through uniquely named temporary files so processes
+        building the same dataset at once never write into each other's files.
+        """
+        dates_path, rates_path, meta_path = self.get_paths(csv_path)
+        signature = self.source_signature(csv_path)
+        dates, rates = self.parse_csv(csv_path)
+
+        for path, array in [(dates_path, dates), (rates_path, rates)]:
+            file_descriptor, temporary_path = tempfile.mkstemp(dir=self.store_dir, suffix=".tmp")
+            with os.fdopen(file_descriptor, "wb") as array_file:
+                np.save(array_file, array)
+            os.replace(temporary_path, path)
+
+        # Metadata last, so a store with current metadata always has complete arrays
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.store_dir, suffix=".tmp")
+        with os.fdopen(file_descriptor, "w") as meta_file:
+            json.dump({"source": os.path.abspath(csv_path), "signature": signature}, meta_file)
+        os.replace(temporary_path, meta_path)
+
+    def is_current(self, csv_path: str):
+        """Whether the stored arrays were built from the CSV as it is now."""
+        dates_path, rates_path, meta_path = self.get_paths(csv_path)
+        if not all(os.path.exists(path) for path in [dates_path, rates_path, meta_path]):
+            return False
+
+        with open(meta_path) as meta_file:
+            return json.load(meta_file).get("signature") == self.source_signature(csv_path)
+
+    def load(self, csv_path: str):
+        """
+        Read-only memory-mapped (dates, rates) arrays of a CSV, building or rebuilding the store if needed.
+
+        Returns
+        -------
+        tuple
+            (datetime64[D] dates sorted ascending, float64 rates) as numpy memmaps.
+        """
+        signature = self.source_signature(csv_path)
+        with self.lock:
+            cached = self.loaded.get(csv_path)
+            if cached is not None and cached[0] == signature:
+                return cached[1], cached[2]
+
+            if not self.is_current(csv_path):
+                logging.info(f"Converting {csv_path} into the rate dataset store")
+                self.build(csv_path)
+
+            dates_path, rates_path, _ = self.get_paths(csv_path)
+            dates = np.load(dates_path, mmap_mode="r")
+            rates = np.load(rates_path, mmap_mode="r")
+            self.loaded[csv_path] = (signature, dates, rates)
+
+        return dates, rates
+
+    def get_range(self, csv_path: str, start=None, end=None):
+        """
+        Dates and rates on [start, end] (either side open when None) as views into the mapped arrays.
+
+        Both ends are found with a binary search on the sorted dates, so nothing is copied.
+        """
+        dates, rates = self.load(csv_path)
+        lower = 0 if start is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(start).date(), "D"), side="left")
+        upper = len(dates) if end is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(end).date(), "D"), side="right")
+
+        return dates[lower:upper], rates[lower:upper]
+
+    def build_all(self, available_data: dict = rfr_datasets_mapping, data_dir: str = "data"):
+        """One-off conversion of every bundled rate dataset that is missing or out of date."""
+        for file_name in available_data.values():
+            self.load(os.path.join(data_dir, file_name))
+
+# Shared by every RFR_Projection in the process
+_rate_dataset_store = None
+_rate_dataset_store_lock = threading.Lock()
+
+def get_rate_dataset_store():
+    """Returns the shared Rate_Dataset_Store, creating it on first use."""
+    global _rate_dataset_store
+    if _rate_dataset_store is None:
+        # Checked again under the lock so the warm-up thread and the first request share one store
+        with _rate_dataset_store_lock:
+            if _rate_dataset_store is None:
+                _rate_dataset_store = Rate_Dataset_Store()
+
+    return _rate_dataset_store
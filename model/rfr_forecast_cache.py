@@ -0,0 +1,91 @@
+from .utils import *
+from .constants import rfr_forecast_cache_dir
+import hashlib
+import tempfile
+
+class RFR_Forecast_Cache:
+    """
+    Memory and on-disk Parquet cache of fitted risk free rate forecasts.
+
+    A forecast is keyed by dataset, projection period, the as-of date (last observation in the CSV) and a
+    hash of the CSV contents, so editing or extending a CSV invalidates its forecasts automatically.
+    """
+
+    def __init__(self, cache_dir: str = rfr_forecast_cache_dir):
+        self.cache_dir = cache_dir
+        self.memory = {}
+        self.file_hashes = {}  # csv path -> ((modified time, size), sha256) so unchanged files are not re-hashed
+        self.lock = threading.Lock()
+        self.key_locks = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def file_hash(self, csv_path: str):
+        """SHA-256 of a CSV, recomputed only when its modified time or size changes."""
+        stat = os.stat(csv_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self.file_hashes.get(csv_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        with open(csv_path, "rb") as csv_file:
+            digest = hashlib.sha256(csv_file.read()).hexdigest()
+        self.file_hashes[csv_path] = (signature, digest)
+        return digest
+
+    def get_path(self, key: tuple):
+        """Parquet file of a (dataset, projection period, as-of date, CSV hash) key."""
+        dataset, proj_period, as_of, digest = key
+        return os.path.join(self.cache_dir, f"{dataset}_{proj_period}_{as_of}_{digest[:16]}.parquet")
+
+    def get_forecast(self, dataset: str, csv_path: str, proj_period: int, read_data, fit_forecast):
+        """
+        Cached forecast of a dataset, fitting and storing it on a miss.
+
+        :param read_data: Callable (csv_path) -> cleaned DataFrame with a "ds" column
+        :param fit_forecast: Callable (DataFrame) -> forecast DataFrame with "Date" and "Rate" columns
+        """
+        digest = self.file_hash(csv_path)
+        memory_key = (dataset, proj_period, digest)
+        with self.lock:
+            if memory_key in self.memory:
+                return self.memory[memory_key]
+            key_lock = self.key_locks.setdefault(memory_key, threading.Lock())
+
+        # One fit per key: a request arriving during the warm-up waits for it instead of fitting again
+        with key_lock:
+            if memory_key in self.memory:
+                return self.memory[memory_key]
+
+            data = read_data(csv_path)
+            path = self.get_path((dataset, proj_period, data["ds"].max().strftime("%Y-%m-%d"), digest))
+
+            if os.path.exists(path):
+                forecast = pd.read_parquet(path)
+            else:
+                logging.info(f"Fitting risk free rate forecast for {dataset}")
+                forecast = fit_forecast(data)
+                # A unique temporary name, so another process fitting the same forecast never shares the file
+                file_descriptor, temporary_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+                os.close(file_descriptor)
+                forecast.to_parquet(temporary_path, index=False)
+                os.replace(temporary_path, path)
+
+            with self.lock:
+                self.memory[memory_key] = forecast
+
+        return forecast
+
+# One cache is shared by every RFR_Projection so the warm-up thread fills it for the request path
+_rfr_forecast_cache = None
+_rfr_forecast_cache_lock = threading.Lock()
+
+def get_rfr_forecast_cache():
+    """Returns the shared RFR_Forecast_Cache, creating it on first use."""
+    global _rfr_forecast_cache
+    if _rfr_forecast_cache is None:
+        # Checked again under the lock so the warm-up thread and the first request share one cache
+        with _rfr_forecast_cache_lock:
+            if _rfr_forecast_cache is None:
+                _rfr_forecast_cache = RFR_Forecast_Cache()
+
+    return _rfr_forecast_cache
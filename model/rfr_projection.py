@@ -1,17 +1,105 @@
-from .utils import pd, Prophet
-from .constants import rfr_datasets_mapping
+from .utils import np, pd, Prophet, threading, logging, lfilter
+from .constants import rfr_datasets_mapping, all_rfr_datasets, rfr_projection_methods
+from .rfr_forecast_cache import get_rfr_forecast_cache
+from .rate_dataset_store import get_rate_dataset_store
 
 class RFR_Projection:
 
-    def __init__(self, proj_period):
+    # proj_period = Number of days to project past the last observation
+    # method = "Prophet" (logistic growth Prophet fit), "Exponential Smoothing" or "Vasicek" (closed form NumPy fits)
+    def __init__(self, proj_period, method: str = "Prophet"):
+        if method.upper() not in [m.upper() for m in rfr_projection_methods]:
+            raise ValueError(f"Unknown projection method: {method}. Use one of {rfr_projection_methods}")
+        if method.upper() == "Prophet".upper() and Prophet is None:
+            raise ImportError("Prophet projections need the prophet package, use the Exponential Smoothing or Vasicek method instead")
+
         self.proj_period = proj_period
+        self.method = method
         self.projected_df = None
 
-    def forecast(self, data: str, available_data: dict = rfr_datasets_mapping):
-        
-        # Read and clean data
-        df = pd.read_csv('data/' + available_data.get(data[:-2]), parse_dates=['ds'], dayfirst=True)
-        df = df[df['y'] != 0]
+    @staticmethod
+    def read_data(csv_path: str):
+        # Cleaned data (zero rates dropped) from the memory-mapped rate store instead of re-parsing the CSV
+        dates, rates = get_rate_dataset_store().load(csv_path)
+        df = pd.DataFrame({'ds': dates.astype('datetime64[ns]'), 'y': np.asarray(rates)})
+
+        return df
+
+    @staticmethod
+    def get_rates(data: str, start=None, end=None, available_data: dict = rfr_datasets_mapping):
+        """
+        Observed rates of a dataset (e.g. "AU-10yr") on [start, end] as zero-copy views of the rate store.
+
+        Returns
+        -------
+        tuple
+            (datetime64[D] dates, float64 rates) read-only arrays.
+        """
+        return get_rate_dataset_store().get_range('data/' + available_data.get(data[:-2]), start, end)
+
+    def future_dates(self, df):
+        """Daily dates of the projection period after the last observation, as Prophet's future frame has."""
+        return pd.date_range(df['ds'].max() + pd.Timedelta(days=1), periods=self.proj_period, freq='D')
+
+    def exponential_smoothing_forecast(self, df):
+        """
+        Simple exponential smoothing: the fitted rate is the smoothed level and the projection stays flat at
+        the last level. The smoothing factor minimises the one step ahead squared error over a grid.
+        """
+        y = df['y'].to_numpy(dtype=float)
+
+        best_sse, best_level = np.inf, None
+        for alpha in np.linspace(0.02, 0.98, 49):
+            # level_t = alpha y_t + (1 - alpha) level_{t-1} is a first order linear filter, started at level_0 = y_0
+            level = np.empty_like(y)
+            level[0] = y[0]
+            level[1:], _ = lfilter([alpha], [1, alpha - 1], y[1:], zi=[(1 - alpha) * y[0]])
+            sse = np.sum((y[1:] - level[:-1])**2)
+            if sse < best_sse:
+                best_sse, best_level = sse, level
+
+        dates = np.concatenate([df['ds'].to_numpy(), self.future_dates(df).to_numpy()])
+        rates = np.concatenate([best_level, np.full(self.proj_period, best_level[-1])])
+        return pd.DataFrame({'Date': dates, 'Rate': rates})
+
+    def vasicek_forecast(self, df):
+        """
+        Vasicek (Ornstein-Uhlenbeck) fit by least squares regression of each rate on the previous one,
+        r_{t+1} = a + b r_t + e. The projection is the expected rate theta + (r_T - theta) exp(-kappa t)
+        with kappa = -ln(b) / dt and theta = a / (1 - b). Without mean reversion (b outside (0, 1))
+        the projection stays flat at the last rate.
+        """
+        y = df['y'].to_numpy(dtype=float)
+        previous, following = y[:-1], y[1:]
+        b = np.cov(previous, following)[0, 1] / np.var(previous, ddof=1)
+        a = following.mean() - b * previous.mean()
+
+        # Average time between observations in years (business days, with gaps for holidays)
+        dt = (df['ds'].max() - df['ds'].min()).days / 365.25 / (len(y) - 1)
+        days_ahead = np.arange(1, self.proj_period + 1)
+
+        if 0 < b < 1:
+            kappa, theta = -np.log(b) / dt, a / (1 - b)
+            projection = theta + (y[-1] - theta) * np.exp(-kappa * days_ahead / 365.25)
+            fitted = np.concatenate([y[:1], a + b * previous])
+        else:
+            projection = np.full(self.proj_period, y[-1])
+            fitted = np.concatenate([y[:1], previous])
+
+        dates = np.concatenate([df['ds'].to_numpy(), self.future_dates(df).to_numpy()])
+        return pd.DataFrame({'Date': dates, 'Rate': np.concatenate([fitted, projection])})
+
+    def fit_forecast(self, df):
+        """Fitted and projected rates of a cleaned dataset with the projection method, as a Date / Rate frame."""
+        if self.method.upper() == "Exponential Smoothing".upper():
+            return self.exponential_smoothing_forecast(df)
+        elif self.method.upper() == "Vasicek".upper():
+            return self.vasicek_forecast(df)
+
+        return self.prophet_forecast(df)
+
+    def prophet_forecast(self, df):
+        df = df.copy()
 
         # Set a pessimistic cap for logistic growth.
         # For example, if your rates are expressed in decimals (e.g., 0.03 for 3%),
@@ -29,8 +117,56 @@ class RFR_Projection:
         
         forecast = m.predict(future)
         
-        self.projected_df = forecast[['ds', 'yhat']]
-        self.projected_df.rename(columns={'ds': 'Date', 'yhat': 'Rate'}, inplace=True)
+        projected_df = forecast[['ds', 'yhat']]
+        projected_df = projected_df.rename(columns={'ds': 'Date', 'yhat': 'Rate'})
+
+        return projected_df
+
+    def forecast(self, data: str, available_data: dict = rfr_datasets_mapping, use_cache: bool = True):
+        """
+        Projects a risk free rate dataset. Prophet forecasts are reused from the cache while the CSV is
+        unchanged, the NumPy methods take milliseconds and are always computed.
+
+        :param data: Dataset name such as "AU-10yr"
+        :param use_cache: False fits a new Prophet model even if a cached forecast exists
+        """
+        dataset = data[:-2]
+        csv_path = 'data/' + available_data.get(dataset)
+
+        if not use_cache or self.method.upper() != "Prophet".upper():
+            self.projected_df = self.fit_forecast(self.read_data(csv_path))
+            return
+
+        forecast = get_rfr_forecast_cache().get_forecast(dataset, csv_path, self.proj_period, self.read_data, self.fit_forecast)
+        # Callers may modify the forecast, the cached one must stay untouched
+        self.projected_df = forecast.copy()
     
     def get_forecast(self):
         return self.projected_df
+
+# Started once per process, Streamlit reruns of the app script reuse it
+_warm_up_thread = None
+
+def warm_up_rfr_forecasts(proj_period: int = 365, datasets: list = all_rfr_datasets):
+    """
+    Fits and caches the Prophet forecast of every risk free rate dataset in a background thread, so the
+    forecasts are ready (or in progress) before the first pricing request needs one.
+    """
+    global _warm_up_thread
+    if _warm_up_thread is not None:
+        return _warm_up_thread
+    if Prophet is None:
+        logging.info("Prophet is not installed, skipping the risk free rate forecast warm-up")
+        return None
+
+    def warm_up():
+        for dataset in datasets:
+            try:
+                RFR_Projection(proj_period).forecast(dataset)
+            except Exception as error:
+                logging.warning(f"Could not warm up the {dataset} risk free rate forecast: {error}")
+
+    _warm_up_thread = threading.Thread(target=warm_up, name="rfr-forecast-warm-up", daemon=True)
+    _warm_up_thread.start()
+
+    return _warm_up_thread
@@ -0,0 +1,100 @@
+from .utils import np, os, threading
+from multiprocessing import shared_memory, resource_tracker, get_context, get_all_start_methods
+import atexit
+
+# Workers start from a fresh interpreter instead of a fork of this one. Numba's parallel kernels start
+# threading layer threads in the parent, and a process forked after that hangs at interpreter exit.
+_START_METHOD = "forkserver" if "forkserver" in get_all_start_methods() else "spawn"
+
+def _simulate_into_shared_memory(task):
+    """
+    Worker entry point: simulates rows [row_start, row_end) straight into the shared buffer
+    and only sends back the small payoff summary needed to price the option.
+    """
+    shm_name, shape, row_start, row_end, batch_parameters, terminal_only, seed_sequence = task
+    # Imported here because euro_option_simulation imports this module
+    from .euro_option_simulation import European_Option_Simulation
+    simulation = European_Option_Simulation.from_batch_parameters(batch_parameters)
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        buffer = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        simulations, payoffs, controls = simulation.simulate_batch(row_end - row_start, terminal_only, seed_sequence)
+        buffer[row_start:row_end] = simulations
+        del buffer
+    finally:
+        shm.close()
+
+    return simulation.summarise_samples(payoffs, controls)
+
+class Simulation_Pool:
+    """Long-lived worker pool that writes simulations into a shared memory buffer."""
+
+    def __init__(self, processes: int):
+        """
+        :param processes: Number of worker processes kept alive between pricing requests
+        """
+        self.processes = processes
+        # Start the tracker before the workers so they share it and don't unlink blocks they attach to
+        if os.name == "posix":
+            resource_tracker.ensure_running()
+        self.pool = get_context(_START_METHOD).Pool(processes=processes)
+
+    def run(self, batch_parameters: dict, sims: int, steps: int, terminal_only: bool = False,
+            seed_sequence: np.random.SeedSequence = None):
+        """
+        Simulates sims paths split evenly across the workers.
+
+        :param batch_parameters: European_Option_Simulation.get_batch_parameters() of the simulation to run
+        :param sims: Total number of paths
+        :param steps: Number of time steps per path
+        :param terminal_only: Only keep S_T, giving a (sims,) buffer instead of (sims, steps + 1)
+        :param seed_sequence: Parent seed; each task gets its own spawned child stream
+        :return: (all_simulations, list of per-task payoff summaries)
+        """
+        shape = (sims,) if terminal_only else (sims, steps + 1)
+        shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1))
+
+        try:
+            # Even row counts keep antithetic pairs inside a single task
+            bounds = 2 * (np.linspace(0, sims // 2, self.processes + 1).astype(int))
+            bounds[-1] = sims
+            if seed_sequence is None:
+                seed_sequence = np.random.SeedSequence()
+            task_seeds = seed_sequence.spawn(self.processes)
+            tasks = [(shm.name, shape, bounds[i], bounds[i + 1], batch_parameters, terminal_only, task_seeds[i])
+                     for i in range(self.processes) if bounds[i + 1] > bounds[i]]
+
+            summaries = self.pool.map(_simulate_into_shared_memory, tasks)
+
+            # Copy out of the shared block so it can be released straight away
+            all_simulations = np.ndarray(shape, dtype=np.float64, buffer=shm.buf).copy()
+        finally:
+            shm.close()
+            shm.unlink()
+
+        return all_simulations, summaries
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+# Pools are created on first use and reused by every later pricing request
+_simulation_pools = {}
+_simulation_pools_lock = threading.Lock()
+
+def get_simulation_pool(processes: int):
+    """Returns the shared Simulation_Pool with the given number of processes, creating it if needed."""
+    if processes not in _simulation_pools:
+        # Checked again under the lock so two threads arriving together never start two pools
+        with _simulation_pools_lock:
+            if processes not in _simulation_pools:
+                _simulation_pools[processes] = Simulation_Pool(processes)
+
+    return _simulation_pools[processes]
+
+@atexit.register
+def _close_simulation_pools():
+    for simulation_pool in _simulation_pools.values():
+        simulation_pool.pool.terminate()
+    _simulation_pools.clear()
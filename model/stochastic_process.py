@@ -1,11 +1,14 @@
-from .utils import np, math
+from .utils import np, math, norm, qmc, warnings
+from .numba_kernels import NUMBA_AVAILABLE, interpolate_rows_kernel, heston_log_paths_kernel
 
 class Stochastic_Process:
-    """Implements various stochastic processes including ABM, GBM, and MMAR."""
+    """Implements various stochastic processes including ABM, GBM, MMAR, Heston and Merton jump diffusion."""
 
-    def __init__(self, type: str, initial_price: float, drift: float, delta_t: float, volatility: float, hurst: float = 0.7, cascade_depth: int = 8, steps: int = 252):
+    def __init__(self, type: str, initial_price: float, drift: float, delta_t: float, volatility: float, hurst: float = 0.7, cascade_depth: int = 8, steps: int = 252, rng: np.random.Generator = None, sampler: str = "Pseudo-Random",
+                 mean_reversion: float = 2.0, long_run_variance: float = None, vol_of_vol: float = 0.3, correlation: float = -0.7, initial_variance: float = None,
+                 jump_intensity: float = 1.0, jump_mean: float = -0.05, jump_volatility: float = 0.1):
         """
-        :param type: Type of stochastic process ("Arithmetic Brownian Motion", "Geometric Brownian Motion", "Multifractal Model of Asset Returns")
+        :param type: Type of stochastic process ("Arithmetic Brownian Motion", "Geometric Brownian Motion", "Multifractal Model of Asset Returns", "Heston Stochastic Volatility", "Merton Jump Diffusion")
         :param initial_price: Initial price of the asset
         :param drift: Drift parameter (mu)
         :param delta_t: Time step size
@@ -13,6 +16,16 @@ class Stochastic_Process:
         :param hurst: Hurst exponent (only for MMAR)
         :param cascade_depth: Number of iterations in the multifractal cascade
         :param steps: Number of time steps (for MMAR)
+        :param rng: Random number generator to draw from (a fresh OS-seeded generator if None)
+        :param sampler: "Pseudo-Random" normals or "Sobol" scrambled quasi-random normals with Brownian bridge paths
+        :param mean_reversion: Speed kappa at which the variance reverts to its long run level (only for Heston)
+        :param long_run_variance: Long run variance theta (only for Heston, defaults to volatility**2)
+        :param vol_of_vol: Volatility xi of the variance process (only for Heston)
+        :param correlation: Correlation rho between the price and variance shocks (only for Heston)
+        :param initial_variance: Variance v0 at time 0 (only for Heston, defaults to volatility**2)
+        :param jump_intensity: Expected number of jumps per year lambda (only for Merton Jump Diffusion)
+        :param jump_mean: Mean of the log jump size (only for Merton Jump Diffusion)
+        :param jump_volatility: Standard deviation of the log jump size (only for Merton Jump Diffusion)
         """
         self.type  = type
         self.drift = drift
@@ -23,66 +36,478 @@ class Stochastic_Process:
         self.hurst = hurst  # Only used in MMAR
         self.cascade_depth = cascade_depth  # Depth of the multifractal cascade
         self.steps = steps  # Number of simulation steps
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.sampler = sampler
+        # Heston variance process dv = kappa (theta - v) dt + xi sqrt(v) dW_v with corr(dW_S, dW_v) = rho
+        self.mean_reversion = mean_reversion
+        self.long_run_variance = volatility**2 if long_run_variance is None else long_run_variance
+        self.vol_of_vol = vol_of_vol
+        self.correlation = correlation
+        self.initial_variance = volatility**2 if initial_variance is None else initial_variance
+        # Merton jumps: Poisson(lambda dt) jumps per step, each multiplying the price by exp(N(jump_mean, jump_volatility^2))
+        self.jump_intensity = jump_intensity
+        self.jump_mean = jump_mean
+        self.jump_volatility = jump_volatility
 
     def time_step(self):
         """Simulates one time step for the stochastic process."""
 
         # **Arithmetic Brownian Motion (ABM)**
         if self.type.upper() == "Arithmetic Brownian Motion".upper(): 
-            dW = np.random.normal(0, math.sqrt(self.delta_t))
+            dW = self.rng.normal(0, math.sqrt(self.delta_t))
             dS = self.drift * self.delta_t + self.volatility * dW
             self.current_price += dS
             self.prices.append(self.current_price)
 
         # **Geometric Brownian Motion (GBM)**
         elif self.type.upper() == "Geometric Brownian Motion".upper():
-            dW = np.random.normal(0, math.sqrt(self.delta_t))
+            dW = self.rng.normal(0, math.sqrt(self.delta_t))
             dS = self.current_price * np.exp(
                 (self.drift - 0.5 * self.volatility**2) * self.delta_t + self.volatility * dW
             ) - self.current_price
             self.current_price += dS
             self.prices.append(self.current_price)
 
+        # **Merton Jump Diffusion**
+        elif self.type.upper() == "Merton Jump Diffusion".upper():
+            dW = self.rng.normal(0, math.sqrt(self.delta_t))
+            jump = self.jump_log_returns((1,), self.delta_t)[0]
+            self.current_price *= np.exp((self.drift - 0.5 * self.volatility**2) * self.delta_t + self.volatility * dW + jump)
+            self.prices.append(self.current_price)
+
         # **Multifractal Model of Asset Returns (MMAR)**
         elif self.type.upper() == "Multifractal Model of Asset Returns".upper():
             # Simulate MMAR over multiple steps
             self.prices = self.simulate_mmar()
             self.current_price = self.prices[-1]  # Update current price
 
+        # **Heston Stochastic Volatility**
+        elif self.type.upper() == "Heston Stochastic Volatility".upper():
+            # The variance is a second state variable, so Heston is only simulated path-wise
+            self.prices = self.simulate_heston_paths(1, self.steps - 1)[0]
+            self.current_price = self.prices[-1]
+
+    def standard_normals(self, sims: int, dimensions: int, antithetic: bool = False):
+        """
+        Draws a (sims, dimensions) array of independent standard normal shocks.
+
+        With the "Sobol" sampler the shocks come from scrambled Sobol points mapped through the
+        inverse normal CDF and are assigned to time steps by Brownian bridge construction, so the
+        first (best distributed) dimensions set the terminal value and the coarse shape of each path.
+
+        :param sims: Number of rows (paths)
+        :param dimensions: Number of shocks per path (time steps)
+        :param antithetic: If True the second half of the rows is the negation of the first half
+        """
+        rows = (sims + 1) // 2 if antithetic else sims
+
+        if self.sampler.upper() == "Sobol".upper():
+            with warnings.catch_warnings():
+                # Sobol balance is best for powers of two but any number of points is still valid
+                warnings.simplefilter("ignore", category=UserWarning)
+                points = qmc.Sobol(d=dimensions, scramble=True, seed=self.rng).random(rows)
+            normals = self.brownian_bridge(norm.ppf(np.clip(points, 1e-12, 1 - 1e-12)))
+        elif self.sampler.upper() == "Pseudo-Random".upper():
+            normals = self.rng.standard_normal((rows, dimensions))
+        else:
+            raise ValueError(f"Unknown sampler: {self.sampler}")
+
+        if not antithetic:
+            return normals
+
+        return np.concatenate([normals, -normals])[:sims]
+
+    @staticmethod
+    def brownian_bridge(normals):
+        """
+        Turns (sims, n) standard normals into n time-ordered standard normal increments via a Brownian bridge.
+
+        Column 0 sets the endpoint W_n, the next columns fill the midpoints of ever finer intervals.
+        """
+        sims, n = normals.shape
+        W = np.zeros((sims, n + 1))
+        W[:, n] = math.sqrt(n) * normals[:, 0]
+
+        column = 1
+        intervals = [(0, n)]
+        while intervals:
+            finer_intervals = []
+            for left, right in intervals:
+                if right - left < 2:
+                    continue
+                mid = (left + right) // 2
+                conditional_sd = math.sqrt((mid - left) * (right - mid) / (right - left))
+                W[:, mid] = ((right - mid) * W[:, left] + (mid - left) * W[:, right]) / (right - left) \
+                    + conditional_sd * normals[:, column]
+                column += 1
+                finer_intervals += [(left, mid), (mid, right)]
+            intervals = finer_intervals
+
+        return np.diff(W, axis=1)
+
+    def has_exact_transition(self):
+        """True if S_T can be sampled in a single step by simulate_terminal."""
+        return self.type.upper() in ["Arithmetic Brownian Motion".upper(), "Geometric Brownian Motion".upper(),
+                                     "Merton Jump Diffusion".upper()]
+
+    def expected_terminal_price(self, horizon: float):
+        """Closed-form E[S_T] under the process drift, or None if the process has no closed form."""
+        initial_price = self.prices[0]
+
+        if self.type.upper() == "Arithmetic Brownian Motion".upper():
+            return initial_price + self.drift * horizon
+        elif self.type.upper() in ["Geometric Brownian Motion".upper(), "Heston Stochastic Volatility".upper(),
+                                   "Merton Jump Diffusion".upper()]:
+            return initial_price * math.exp(self.drift * horizon)
+
+        return None
+
+    def jump_log_returns(self, shape, delta_t):
+        """
+        Compensated compound Poisson log-jumps over intervals of length delta_t, or 0 for processes without jumps.
+
+        For (sims, n) arrays each path draws its total number of jumps in one bulk Poisson draw and the
+        jumps are scattered over the intervals in proportion to their length, which gives the same
+        independent Poisson counts per interval without a Poisson draw (or any work) per path and step.
+        Each jump is N(jump_mean, jump_volatility^2) in log space. The compensator -lambda k dt keeps
+        E[S_T] = S_0 exp(drift T).
+
+        :param shape: Shape of the returned array, e.g. (sims, steps) or (sims,)
+        :param delta_t: Interval length in years, a float or an array broadcastable to shape
+        """
+        if self.type.upper() != "Merton Jump Diffusion".upper():
+            return 0.0
+
+        jump_compensator = math.exp(self.jump_mean + 0.5 * self.jump_volatility**2) - 1
+        intervals = np.broadcast_to(np.asarray(delta_t, dtype=float), shape[-1:])
+
+        jumps = np.empty(shape)
+        jumps[...] = -self.jump_intensity * jump_compensator * intervals
+
+        if len(shape) < 2:
+            counts = self.rng.poisson(self.jump_intensity * intervals, shape)
+            jumps += self.jump_mean * counts + self.jump_volatility * np.sqrt(counts) * self.rng.standard_normal(shape)
+            return jumps
+
+        paths = jumps.reshape(-1, shape[-1])
+        path_counts = self.rng.poisson(self.jump_intensity * intervals.sum(), paths.shape[0])
+        jump_paths = np.repeat(np.arange(paths.shape[0]), path_counts)
+        cumulative_share = np.cumsum(intervals) / intervals.sum()
+        jump_intervals = np.minimum(np.searchsorted(cumulative_share, self.rng.random(len(jump_paths)), side="right"),
+                                    shape[-1] - 1)
+        np.add.at(paths, (jump_paths, jump_intervals),
+                  self.jump_mean + self.jump_volatility * self.rng.standard_normal(len(jump_paths)))
+
+        return jumps
+
+    def simulate_paths(self, sims: int, steps: int, normals=None):
+        """
+        Simulates every path of the process at once as a single (sims, steps + 1) array.
+
+        All normal shocks are drawn in one bulk call and the paths are built with a cumulative
+        sum (ABM) or a cumulative product via the log-price (GBM), so no Python loop runs per step.
+
+        :param sims: Number of paths to simulate
+        :param steps: Number of time steps of size delta_t in each path
+        :param normals: Optional (sims, steps) standard normal shocks to use instead of fresh draws
+        :return: Array of prices where column 0 is the initial price and column -1 the price after all steps
+        """
+        initial_price = self.prices[0]
+
+        if normals is None:
+            normals = self.standard_normals(sims, steps)
+
+        # **Arithmetic Brownian Motion (ABM)**
+        if self.type.upper() == "Arithmetic Brownian Motion".upper():
+            dW = normals * math.sqrt(self.delta_t)
+            dS = self.drift * self.delta_t + self.volatility * dW
+            paths = np.empty((sims, steps + 1))
+            paths[:, 0] = initial_price
+            np.cumsum(dS, axis=1, out=paths[:, 1:])
+            paths[:, 1:] += initial_price
+            return paths
+
+        # **Geometric Brownian Motion (GBM)** and **Merton Jump Diffusion**
+        elif self.type.upper() in ["Geometric Brownian Motion".upper(), "Merton Jump Diffusion".upper()]:
+            dW = normals * math.sqrt(self.delta_t)
+            log_returns = (self.drift - 0.5 * self.volatility**2) * self.delta_t + self.volatility * dW
+            log_returns += self.jump_log_returns(log_returns.shape, self.delta_t)
+            paths = np.empty((sims, steps + 1))
+            paths[:, 0] = 0.0
+            np.cumsum(log_returns, axis=1, out=paths[:, 1:])
+            np.exp(paths, out=paths)
+            paths *= initial_price
+            return paths
+
+        # **Multifractal Model of Asset Returns (MMAR)**
+        elif self.type.upper() == "Multifractal Model of Asset Returns".upper():
+            return self.simulate_mmar_paths(sims, steps, normals)
+
+        # **Heston Stochastic Volatility**
+        elif self.type.upper() == "Heston Stochastic Volatility".upper():
+            return self.simulate_heston_paths(sims, steps, normals)
+
+        raise ValueError(f"Unknown stochastic process: {self.type}")
+
+    def simulate_path_blocks(self, sims: int, steps: int, block_steps: int = 64, antithetic: bool = False):
+        """
+        Yields the paths one block of time steps at a time instead of as a single matrix.
+
+        ABM, GBM and Merton jump diffusion with pseudo-random shocks carry each path's current price from block to block, so only
+        a (sims, block_steps) array is ever alive. Sobol paths (Brownian bridge), MMAR (cascade over the
+        whole horizon) and Heston are simulated in full for these sims and sliced.
+
+        :param sims: Number of paths
+        :param steps: Number of time steps of size delta_t in each path
+        :param block_steps: Maximum number of time steps in each yielded block
+        :param antithetic: If True the second half of the rows mirrors the shocks of the first half
+        :return: Generator of (sims, <= block_steps) arrays holding the prices after steps 1 to steps in order
+        """
+        if self.has_exact_transition() and self.sampler.upper() == "Pseudo-Random".upper():
+            current_prices = np.full(sims, float(self.prices[0]))
+
+            for block_start in range(0, steps, block_steps):
+                block_length = min(block_steps, steps - block_start)
+                dW = self.standard_normals(sims, block_length, antithetic) * math.sqrt(self.delta_t)
+
+                # **Arithmetic Brownian Motion (ABM)**
+                if self.type.upper() == "Arithmetic Brownian Motion".upper():
+                    block = current_prices[:, None] + np.cumsum(self.drift * self.delta_t + self.volatility * dW, axis=1)
+
+                # **Geometric Brownian Motion (GBM)** and **Merton Jump Diffusion**
+                else:
+                    log_returns = (self.drift - 0.5 * self.volatility**2) * self.delta_t + self.volatility * dW
+                    log_returns += self.jump_log_returns(log_returns.shape, self.delta_t)
+                    block = current_prices[:, None] * np.exp(np.cumsum(log_returns, axis=1))
+
+                current_prices = block[:, -1]
+                yield block
+            return
+
+        normals = self.standard_normals(sims, steps, antithetic) if antithetic else None
+        paths = self.simulate_paths(sims, steps, normals)
+        for block_start in range(1, steps + 1, block_steps):
+            yield paths[:, block_start:block_start + block_steps]
+
+    def simulate_terminal(self, sims: int, horizon: float, normals=None):
+        """
+        Samples the price at the horizon directly from the exact transition of the process.
+
+        Only a 1-D array of terminal prices is kept, so memory and run time no longer grow with
+        the number of time steps. MMAR and Heston have no closed-form transition and are simulated path-wise.
+
+        :param sims: Number of terminal prices to sample
+        :param horizon: Time until the horizon in years
+        :param normals: Optional (sims,) standard normal shocks to use instead of fresh draws (ABM/GBM/Merton only,
+                        MMAR and Heston draw their own per-step shocks)
+        :return: Array of shape (sims,) with the sampled terminal prices
+        """
+        initial_price = self.prices[0]
+
+        # **Arithmetic Brownian Motion (ABM)**
+        if self.type.upper() == "Arithmetic Brownian Motion".upper():
+            W = (self.standard_normals(sims, 1)[:, 0] if normals is None else normals) * math.sqrt(horizon)
+            return initial_price + self.drift * horizon + self.volatility * W
+
+        # **Geometric Brownian Motion (GBM)** and **Merton Jump Diffusion**
+        elif self.type.upper() in ["Geometric Brownian Motion".upper(), "Merton Jump Diffusion".upper()]:
+            W = (self.standard_normals(sims, 1)[:, 0] if normals is None else normals) * math.sqrt(horizon)
+            return initial_price * np.exp((self.drift - 0.5 * self.volatility**2) * horizon + self.volatility * W
+                                          + self.jump_log_returns((sims,), horizon))
+
+        # **Multifractal Model of Asset Returns (MMAR)** and **Heston Stochastic Volatility**
+        if normals is not None:
+            raise ValueError(f"{self.type} has no exact transition, supply per-step normals to simulate_paths instead")
+        steps = max(int(round(horizon / self.delta_t)), 1)
+        return self.simulate_paths(sims, steps)[:, -1]
+
+    def simulate_horizons(self, sims: int, horizons, normals=None):
+        """
+        Samples the price at several increasing horizons along the same paths.
+
+        ABM, GBM and Merton jump diffusion chain exact transitions between consecutive horizons, so the cost depends on the
+        number of horizons rather than the number of time steps. MMAR and Heston simulate the full paths
+        to the last horizon and read off the prices at each horizon's step.
+
+        :param sims: Number of paths
+        :param horizons: Increasing times in years at which to record the price
+        :param normals: Optional (sims, len(horizons)) standard normal shocks (ABM/GBM/Merton only)
+        :return: Array of shape (sims, len(horizons))
+        """
+        horizons = np.asarray(horizons, dtype=float)
+
+        if not self.has_exact_transition():
+            horizon_steps = np.maximum(np.round(horizons / self.delta_t).astype(int), 1)
+            return self.simulate_paths(sims, int(horizon_steps.max()))[:, horizon_steps]
+
+        if normals is None:
+            normals = self.standard_normals(sims, len(horizons))
+        increments = np.diff(horizons, prepend=0.0)
+        dW = normals * np.sqrt(increments)
+
+        # **Arithmetic Brownian Motion (ABM)**
+        if self.type.upper() == "Arithmetic Brownian Motion".upper():
+            return self.prices[0] + np.cumsum(self.drift * increments + self.volatility * dW, axis=1)
+
+        # **Geometric Brownian Motion (GBM)** and **Merton Jump Diffusion**
+        log_returns = (self.drift - 0.5 * self.volatility**2) * increments + self.volatility * dW
+        log_returns += self.jump_log_returns(log_returns.shape, increments)
+        return self.prices[0] * np.exp(np.cumsum(log_returns, axis=1))
+
     def generate_multifractal_time(self):
         """
         Generate a binomial multiplicative cascade for time deformation.
         The cascade assigns random "market activity rates" to each time step.
         """
-        weights = np.ones(self.steps)
+        return self.generate_multifractal_times(1, self.steps)[0]
+
+    def generate_multifractal_times(self, sims: int, steps: int):
+        """
+        Generate one binomial multiplicative cascade per path as a (sims, steps) array of deformed times.
+
+        :param sims: Number of paths
+        :param steps: Number of time steps in each path
+        """
+        weights = np.ones((sims, steps))
 
+        # U(0.2, 0.8) is symmetric about 0.5, so choosing between u and 1 - u with a coin flip
+        # gives the same distribution as u itself and the extra draw can be skipped
         for _ in range(self.cascade_depth):
-            rand_split = np.random.uniform(0.2, 0.8, self.steps)
-            weights *= np.where(np.random.rand(self.steps) < 0.5, rand_split, 1 - rand_split)
+            weights *= self.rng.uniform(0.2, 0.8, (sims, steps))
 
         # Normalize and ensure strictly increasing time
-        multifractal_time = np.cumsum(weights / np.sum(weights)) * self.steps * self.delta_t
-        multifractal_time = np.maximum.accumulate(multifractal_time)
-        
+        multifractal_time = np.cumsum(weights / np.sum(weights, axis=1, keepdims=True), axis=1) * steps * self.delta_t
+        multifractal_time = np.maximum.accumulate(multifractal_time, axis=1)
+
         return multifractal_time
 
+    @staticmethod
+    def interpolate_rows(x, xp, fp):
+        """
+        Row-wise np.interp: interpolates x (shared by all rows) against each row of xp and fp.
+
+        :param x: (n,) points to evaluate
+        :param xp: (sims, m) increasing sample points per row
+        :param fp: (sims, m) sample values per row
+        :return: (sims, n) interpolated values, clamped to the end values like np.interp
+        """
+        sims, m = xp.shape
+
+        # Compiled kernel: a parallel per-row sweep, no offset matrix or searchsorted over all rows
+        if NUMBA_AVAILABLE:
+            interpolated = np.empty((sims, len(x)))
+            interpolate_rows_kernel(np.ascontiguousarray(x, dtype=float), np.ascontiguousarray(xp, dtype=float),
+                                    np.ascontiguousarray(fp, dtype=float), interpolated)
+            return interpolated
+
+        # Shift every row into its own disjoint range so one searchsorted covers the whole matrix
+        row_offsets = np.arange(sims)[:, None] * (np.abs(xp).max() + np.abs(x).max() + 1.0)
+        flat_index = np.searchsorted((xp + row_offsets).ravel(), (x[None, :] + row_offsets).ravel(), side="right")
+        upper = flat_index.reshape(sims, -1) - np.arange(sims)[:, None] * m
+
+        lower_index = np.clip(upper - 1, 0, m - 1)
+        upper_index = np.clip(upper, 0, m - 1)
+
+        xp_lower = np.take_along_axis(xp, lower_index, axis=1)
+        xp_upper = np.take_along_axis(xp, upper_index, axis=1)
+        fp_lower = np.take_along_axis(fp, lower_index, axis=1)
+        fp_upper = np.take_along_axis(fp, upper_index, axis=1)
+
+        span = xp_upper - xp_lower
+        weight = np.divide(x[None, :] - xp_lower, span, out=np.zeros_like(span), where=span > 0)
+
+        return fp_lower + np.clip(weight, 0, 1) * (fp_upper - fp_lower)
+
     def simulate_mmar(self):
         """
         Simulates MMAR using a GBM base model and multifractal time deformation.
         """
+        return self.simulate_mmar_paths(1, self.steps - 1)[0]
+
+    def simulate_mmar_paths(self, sims: int, steps: int, normals=None):
+        """
+        Simulates MMAR for all paths at once using a GBM base model and multifractal time deformation.
+
+        The cascades, GBM returns and time-deformed returns are all (sims, steps) arrays sized to the horizon.
+
+        :param sims: Number of paths to simulate
+        :param steps: Number of time steps of size delta_t in each path
+        :param normals: Optional (sims, steps) standard normal shocks to use instead of fresh draws
+        :return: Array of shape (sims, steps + 1) starting at the initial price
+        """
+        if normals is None:
+            normals = self.standard_normals(sims, steps)
+
         # Generate GBM log-returns
-        normal_shocks = np.random.normal(0, np.sqrt(self.delta_t), self.steps)
-        returns = (self.drift - 0.5 * self.volatility**2) * self.delta_t + self.volatility * normal_shocks
+        returns = (self.drift - 0.5 * self.volatility**2) * self.delta_t + self.volatility * math.sqrt(self.delta_t) * normals
 
         # Generate multifractal time
-        fractal_time = self.generate_multifractal_time()
+        fractal_time = self.generate_multifractal_times(sims, steps)
 
         # Apply time deformation: Interpolate GBM returns using multifractal time
-        time_deformed_returns = np.interp(np.arange(self.steps) * self.delta_t, fractal_time, returns)
+        time_deformed_returns = self.interpolate_rows(np.arange(steps) * self.delta_t, fractal_time, returns)
+
+        # Compute log-price path (start at log(S0)) and convert back to normal price scale
+        paths = np.empty((sims, steps + 1))
+        paths[:, 0] = 0.0
+        np.cumsum(time_deformed_returns, axis=1, out=paths[:, 1:])
+        np.exp(paths, out=paths)
+        paths *= self.prices[0]
+
+        return paths
+
+    def simulate_heston_paths(self, sims: int, steps: int, normals=None):
+        """
+        Simulates the Heston model for all paths with a full truncation Euler scheme.
+
+        Each time step advances every path at once: the log-price and the variance use the truncated
+        variance max(v, 0), which keeps the square roots real while letting v itself dip below zero.
+        With Numba installed a compiled kernel runs the same scheme over blocks of paths on all cores.
+
+        :param sims: Number of paths to simulate
+        :param steps: Number of time steps of size delta_t in each path
+        :param normals: Optional (sims, steps) standard normal shocks driving the price; the independent
+                        part of the variance shocks is always drawn from rng
+        :return: Array of shape (sims, steps + 1) starting at the initial price
+        """
+        if normals is None:
+            normals = self.standard_normals(sims, steps)
+
+        kappa, theta, xi, rho = self.mean_reversion, self.long_run_variance, self.vol_of_vol, self.correlation
+        dt, sqrt_dt = self.delta_t, math.sqrt(self.delta_t)
+
+        # Time-major arrays so every step reads and writes contiguous rows. The shocks are pre-scaled
+        # by sqrt(dt) and the variance shocks pre-correlated, leaving only the state updates in the loop.
+        price_shocks = np.ascontiguousarray(normals.T) * sqrt_dt
+        variance_shocks = self.rng.standard_normal((steps, sims))
+        variance_shocks *= xi * math.sqrt(1 - rho**2) * sqrt_dt
+        variance_shocks += xi * rho * price_shocks
+
+        log_paths = np.empty((steps + 1, sims))
+
+        if NUMBA_AVAILABLE:
+            heston_log_paths_kernel(self.drift, dt, kappa, theta, float(self.initial_variance),
+                                    price_shocks, variance_shocks, log_paths)
+        else:
+            log_paths[0] = 0.0
+            variance = np.full(sims, float(self.initial_variance))
+            truncated_variance = np.empty(sims)
+            volatility = np.empty(sims)
+
+            for step in range(steps):
+                np.maximum(variance, 0, out=truncated_variance)
+                np.sqrt(truncated_variance, out=volatility)
+
+                # ln S += (mu - v/2) dt + sqrt(v) dW_S
+                np.multiply(volatility, price_shocks[step], out=log_paths[step + 1])
+                log_paths[step + 1] += log_paths[step] + self.drift * dt
+                log_paths[step + 1] -= (0.5 * dt) * truncated_variance
+
+                # v += kappa (theta - v) dt + xi sqrt(v) dW_v
+                variance += kappa * dt * (theta - truncated_variance)
+                variance += volatility * variance_shocks[step]
 
-        # Compute log-price path (start at log(S0))
-        log_prices = np.cumsum(time_deformed_returns)
-        log_prices = log_prices - log_prices[0] + np.log(self.prices[0])
+        np.exp(log_paths, out=log_paths)
+        log_paths *= self.prices[0]
 
-        # Convert back to normal price scale
-        return np.exp(log_prices)
+        return np.ascontiguousarray(log_paths.T)
@@ -5,6 +5,10 @@ from .rfr_projection import RFR_Projection
 from .volaility_model_MLE import Return_Volatility_Minimisation
 from .volatility_model_ML import ML_Volatility_Model
 from .euro_option_simulation import European_Option_Simulation
+from .american_option_simulation import American_Option_Simulation
+from .analytic_pricing import black_scholes_price, black_scholes_greeks
+from .price_history_cache import get_price_history_cache
+from .market_data_provider import split_by_ticker
 
 def supress_warnings():
     # This prevents cmdstanpy from printing "Chain [1] start processing"
@@ -35,19 +39,16 @@ def get_end_date(start_date, tte):
 
     return end_date
 
-def get_stock_data(ticker, start, end, price_column='Adj Close'):
+def get_stock_data(ticker, start, end, price_column='Adj Close', offline: bool = False):
     """
-    Retrieve historical stock price data using yfinance.
+    Retrieve historical stock price data, from the local price history cache where possible
+    and from the market data provider for any dates not cached yet (never when offline).
     """
 
     # Log
     logging.info("Retrieving historical stock data")
 
-    data = yf.download(ticker, start=start, end=end, progress=True, auto_adjust=True)
-
-    # If MultiIndex, drop the second level (ticker name)
-    if isinstance(data.columns, pd.MultiIndex):
-        data.columns = data.columns.droplevel(1)  # Remove 'MSFT' part
+    data = get_price_history_cache().get_history(ticker, start, end, offline=offline)
 
     if data.empty:
         raise ValueError(f"No data found for ticker: {ticker}")
@@ -60,22 +61,41 @@ def get_stock_data(ticker, start, end, price_column='Adj Close'):
 
     return [data, start, end, price_column]
 
-def get_rfr(start_date, tte, suffix: str):
+def get_multi_asset_stock_data(tickers: list, start, end, offline: bool = False):
+    """
+    Retrieve historical prices of several tickers through the local price history cache.
+
+    Returns a DataFrame of closing prices with one column per ticker, restricted to the dates
+    on which every ticker traded so the returns line up for correlation estimates.
+    """
+
+    # Log
+    logging.info(f"Retrieving historical stock data for {len(tickers)} tickers")
+
+    data = get_price_history_cache().get_histories(tickers, start, end, offline=offline)
+
+    missing = [ticker for ticker in tickers if data.empty or ticker not in data['Close'].columns]
+    if missing:
+        raise ValueError(f"No data found for ticker(s): {', '.join(missing)}")
+
+    return data['Close'][list(tickers)].dropna()
+
+def get_rfr(start_date, tte, suffix: str, method: str = "Prophet"):
     # Log
     logging.info("Projecting and retrieving risk free rate")
     
     end_date = get_end_date(start_date, tte)
     
-    # Set up risk free rate forecast
-    rfr = RFR_Projection(365)
+    # Set up risk free rate forecast (method is one of rfr_projection_methods)
+    rfr = RFR_Projection(365, method=method)
     rfr.forecast(suffix)
     rfr_forecast_results = rfr.get_forecast()
 
-    # Filter for appropriate risk free rates
-    rfr_range = rfr_forecast_results[
-    (rfr_forecast_results['Date'] >= start_date) &
-    (rfr_forecast_results['Date'] <= end_date)
-    ]
+    # Filter for appropriate risk free rates, the forecast dates are sorted so a binary search finds both ends
+    forecast_dates = rfr_forecast_results['Date'].to_numpy()
+    lower = np.searchsorted(forecast_dates, np.datetime64(start_date), side='left')
+    upper = np.searchsorted(forecast_dates, np.datetime64(end_date), side='right')
+    rfr_range = rfr_forecast_results.iloc[lower:upper]
     # Calculate present value of price of call option
     rfr = np.average(rfr_range['Rate'])
 
@@ -233,7 +253,7 @@ def format_value(symbol: str, value: float, decimal_places: int):
         return value  # Return unformatted value if symbol is not recognized
 
 
-def run_pricing_model(ticker: str, start_date: str, tte: int, manual_input_data: list, strike: float, stock_data_start: str = "2022-01-01", stock_data_end: str = "2025-03-30", rfr_suffix: str = "AU-10", simulations: int = 10000):
+def run_pricing_model(ticker: str, start_date: str, tte: int, manual_input_data: list, strike: float, stock_data_start: str = "2022-01-01", stock_data_end: str = "2025-03-30", rfr_suffix: str = "AU-10", simulations: int = 10000, terminal_only: bool = False, seed: int = None, pricing_engine: str = "Analytic", monte_carlo_check: bool = False, exercise_style: str = "European", rfr_method: str = "Prophet"):
     """
     Simulates option pricing for a European call/put option using a Monte Carlo method 
     based on Geometric Brownian Motion (GBM).
@@ -262,6 +282,21 @@ def run_pricing_model(ticker: str, start_date: str, tte: int, manual_input_data:
         Which government bond yields to use for risk free rate forecast (default: "AU-10").
     simulations : int, optional
         The number of Monte Carlo simulations to run (default: 10,000).
+    terminal_only : bool, optional
+        Only sample the terminal price S_T instead of full daily paths (default: False).
+    seed : int, optional
+        Seed for the simulation random streams, making the run reproducible (default: None, unseeded).
+    pricing_engine : str, optional
+        "Analytic" prices GBM European options with the closed-form Black-Scholes formula, "Monte Carlo"
+        always simulates. Other processes fall back to Monte Carlo (default: "Analytic").
+    monte_carlo_check : bool, optional
+        Also run the Monte Carlo simulation as a cross-check when priced analytically (default: False).
+    exercise_style : str, optional
+        "European" or "American". American options are always simulated and priced with
+        Longstaff-Schwartz least squares regression on the full paths (default: "European").
+    rfr_method : str, optional
+        How to project the risk free rate: "Prophet", or the much faster "Exponential Smoothing" and
+        "Vasicek" NumPy fits (default: "Prophet").
 
     Returns
     -------
@@ -280,8 +315,14 @@ def run_pricing_model(ticker: str, start_date: str, tte: int, manual_input_data:
         - "put price" (float): The estimated fair value of the European put option.
         - "stock prices" (NDArray): Contains all historic stock price data and associated dates
         - "stock dates" (NDArray): Contains all the assocaited dates for the stock prices
-        - "all simulations" (list): Contains lists of all geometric brownian motion stock price simulations
+        - "all simulations" (NDArray): All simulated price paths, or only the terminal prices if terminal_only
+          (None if priced analytically without a Monte Carlo check)
         - "rfr dataset" (str): Contains the code of which dataset risk free rate was generated from
+        - "seed" (int): The seed used for the simulation random streams (None if unseeded)
+        - "pricing engine" (str): The engine that produced the call and put prices
+        - "monte carlo call price" (float): Monte Carlo call price from the cross-check (None if not run)
+        - "monte carlo put price" (float): Monte Carlo put price from the cross-check (None if not run)
+        - "exercise style" (str): Whether the prices are for European or American options
     """
     # Check and distribute any manual input data, [0] = volatility, [1] = rfr
     manual_volatility = manual_input_data[0]
@@ -310,7 +351,7 @@ def run_pricing_model(ticker: str, start_date: str, tte: int, manual_input_data:
             st.write("📈 Analyzing market risk free rate...")
     calculation_status.update(state="running")
 
-    rfr, rfr_range = get_rfr(start_date, tte, rfr_suffix)
+    rfr, rfr_range = get_rfr(start_date, tte, rfr_suffix, method=rfr_method)
     if manual_rfr:
         rfr = manual_rfr
         rfr_range['Rate'] = manual_rfr
@@ -332,29 +373,54 @@ def run_pricing_model(ticker: str, start_date: str, tte: int, manual_input_data:
     spot_price = get_spot_price(start_date, minimiser)
     print(f"Spot Price: ${spot_price:.3f}")
 
-    # Step 4: Running monte carlo simulations
-    with calculation_status:
-            st.write("🎲 Running Simulations...")
-    calculation_status.update(state="running")
+    # Closed-form Black-Scholes is exact for European options on a geometric brownian motion
+    is_american = exercise_style.upper() == "American".upper()
+    use_analytic = pricing_engine.upper() == "Analytic".upper() and not is_american and \
+        str(manual_stochastic_process).upper() == "Geometric Brownian Motion".upper()
+    if pricing_engine.upper() == "Analytic".upper() and not use_analytic:
+        logging.warning(f"No analytic price for {exercise_style} options on {manual_stochastic_process}, falling back to Monte Carlo")
 
-    logging.info("Now running stochastic differential equations to calculate option price")
-    
-    simulation = European_Option_Simulation(
-        stochastic_process_type=str(manual_stochastic_process),
-        strike=Strike(strike),
-        sims=simulations,
-        initial_price=spot_price,
-        drift=rfr,
-        delta_t=1/365,
-        volatility=future_volatility,
-        tte=tte/365,
-        rfr_appropriate_dates=rfr_range
-    )
+    call_price, put_price, all_simulations = None, None, None
+    monte_carlo_call_price, monte_carlo_put_price = None, None
+
+    # Step 4: Pricing the option
+    if use_analytic:
+        with calculation_status:
+                st.write("🧮 Evaluating Black-Scholes formula...")
+        calculation_status.update(state="running")
+
+        logging.info("Now evaluating Black-Scholes formula to calculate option price")
+
+        call_price = black_scholes_price(spot_price, strike, tte/365, rfr, future_volatility, "call")
+        put_price = black_scholes_price(spot_price, strike, tte/365, rfr, future_volatility, "put")
+
+    if not use_analytic or monte_carlo_check:
+        with calculation_status:
+                st.write("🎲 Running Simulations...")
+        calculation_status.update(state="running")
+
+        logging.info("Now running stochastic differential equations to calculate option price")
+
+        if is_american:
+            # Early exercise needs every path, so terminal_only does not apply
+            monte_carlo_call_price, monte_carlo_put_price, all_simulations = run_american_simulation(
+                manual_stochastic_process, strike, simulations, spot_price, rfr, future_volatility, tte, rfr_range,
+                seed
+            )
+        else:
+            monte_carlo_call_price, monte_carlo_put_price, all_simulations = run_monte_carlo_simulation(
+                manual_stochastic_process, strike, simulations, spot_price, rfr, future_volatility, tte, rfr_range,
+                seed, terminal_only
+            )
+
+        if use_analytic:
+            logging.info(f"Monte Carlo check: call ${monte_carlo_call_price:.3f} vs ${call_price:.3f}, "
+                         f"put ${monte_carlo_put_price:.3f} vs ${put_price:.3f}")
+        else:
+            call_price, put_price = monte_carlo_call_price, monte_carlo_put_price
 
-    # Run simulations with multiprocessing
-    call_price, put_price, all_simulations = simulation.run_multiprocessing(12)
     print(f"Call Option Price: ${call_price:.3f}")
-    print(f"Call Option Price: ${put_price:.3f}")
+    print(f"Put Option Price: ${put_price:.3f}")
 
     calculation_status.update(label="🧮 Model results loading...", state="running") 
 
@@ -381,9 +447,54 @@ def run_pricing_model(ticker: str, start_date: str, tte: int, manual_input_data:
         "stock dates": minimiser.dates,
         "all simulations": all_simulations,
         "calculation status": calculation_status,
-        "rfr dataset": rfr_suffix
+        "rfr dataset": rfr_suffix,
+        "rfr method": rfr_method,
+        "seed": seed,
+        "pricing engine": "Analytic" if use_analytic else "Monte Carlo",
+        "monte carlo call price": monte_carlo_call_price,
+        "monte carlo put price": monte_carlo_put_price,
+        "exercise style": "American" if is_american else "European"
     }
 
+def run_monte_carlo_simulation(stochastic_process, strike, simulations, spot_price, rfr, volatility, tte, rfr_range,
+                               seed=None, terminal_only=False):
+    """Runs the multiprocessed European option Monte Carlo and returns (call price, put price, all simulations)."""
+    simulation = European_Option_Simulation(
+        stochastic_process_type=str(stochastic_process),
+        strike=Strike(strike),
+        sims=simulations,
+        initial_price=spot_price,
+        drift=rfr,
+        delta_t=1/365,
+        volatility=volatility,
+        tte=tte/365,
+        rfr_appropriate_dates=rfr_range,
+        seed=seed
+    )
+
+    # Run simulations with multiprocessing
+    return simulation.run_multiprocessing(12, terminal_only=terminal_only)
+
+def run_american_simulation(stochastic_process, strike, simulations, spot_price, rfr, volatility, tte, rfr_range,
+                            seed=None, exercise_frequency=1):
+    """Prices the American call and put with Longstaff-Schwartz and returns (call price, put price, all simulations)."""
+    simulation = American_Option_Simulation(
+        stochastic_process_type=str(stochastic_process),
+        strike=Strike(strike),
+        sims=simulations,
+        initial_price=spot_price,
+        drift=rfr,
+        delta_t=1/365,
+        volatility=volatility,
+        tte=tte/365,
+        rfr_appropriate_dates=rfr_range,
+        seed=seed,
+        exercise_frequency=exercise_frequency
+    )
+
+    # The regression couples every path at each exercise date, so this runs in a single process
+    return simulation.run_longstaff_schwartz()
+
 def calculate_greeks(option_type: str, S: float, K: float, T: float, r: float, sigma: float, decimals: int = 4):
     """
     Compute the Greeks for a European call or put option using the Black-Scholes model.
@@ -420,23 +531,44 @@ def calculate_greeks(option_type: str, S: float, K: float, T: float, r: float, s
     >>> calculate_greeks("call", 100, 100, 1, 0.05, 0.2)
     {'Delta': 0.6368, 'Gamma': 0.0198, 'Theta': -0.0176, 'Vega': 0.3973, 'Rho': 0.5323}
     """
-    d1 = (np.log(S / K) + (r + (sigma ** 2) / 2) * T) / (sigma * np.sqrt(T))
-    d2 = d1 - sigma * np.sqrt(T)
+    greeks = black_scholes_greeks(S, K, T, r, sigma, option_type)
 
-    delta = si.norm.cdf(d1) if option_type.lower() == "call" else si.norm.cdf(d1) - 1
-    gamma = si.norm.pdf(d1) / (S * sigma * np.sqrt(T))
-    theta = (- (S * si.norm.pdf(d1) * sigma) / (2 * np.sqrt(T))) - (r * K * np.exp(-r * T) * si.norm.cdf(d2)) if option_type.lower() == "call" else (- (S * si.norm.pdf(d1) * sigma) / (2 * np.sqrt(T))) + (r * K * np.exp(-r * T) * si.norm.cdf(-d2))
-    vega = S * si.norm.pdf(d1) * np.sqrt(T)
-    rho = K * T * np.exp(-r * T) * si.norm.cdf(d2) if option_type == "call" else -K * T * np.exp(-r * T) * si.norm.cdf(-d2)
+    return format_greeks(greeks, decimals)
 
+def format_greeks(greeks: dict, decimals: int = 4, index=()):
+    """
+    Display format of one contract from black_scholes_greeks: theta per day, vega and rho per 1% move.
+
+    index selects the contract when the Greeks are arrays over several contracts.
+    """
     return {
-        "Delta": ("%", decimals, delta),
-        "Gamma": ("%", decimals, gamma),
-        "Theta": ("%", decimals, theta/365),
-        "Vega": ("%", decimals, vega/100),
-        "Rho": ("%", decimals, rho/100)
+        "Delta": ("%", decimals, float(greeks["delta"][index])),
+        "Gamma": ("%", decimals, float(greeks["gamma"][index])),
+        "Theta": ("%", decimals, float(greeks["theta"][index])/365),
+        "Vega": ("%", decimals, float(greeks["vega"][index])/100),
+        "Rho": ("%", decimals, float(greeks["rho"][index])/100)
     }
 
+def calculate_call_put_greeks(S: float, K: float, T: float, r: float, sigma: float, decimals: int = 4):
+    """
+    Greeks of the call and the put on the same contract terms, from a single vectorised
+    black_scholes_greeks call that shares d1, d2 and the normal pdf between both legs.
+
+    Returns
+    -------
+    tuple
+        (call Greeks, put Greeks) in the format of calculate_greeks().
+
+    Example
+    -------
+    >>> call_greeks, put_greeks = calculate_call_put_greeks(100, 100, 1, 0.05, 0.2)
+    >>> round(call_greeks["Delta"][2], 4), round(put_greeks["Delta"][2], 4)
+    (0.6368, -0.3632)
+    """
+    greeks = black_scholes_greeks(S, K, T, r, sigma, ["call", "put"])
+
+    return format_greeks(greeks, decimals, 0), format_greeks(greeks, decimals, 1)
+
 def implied_volatility(market_price, S, K, T, r, option_type="call"):
     """
     Computes the implied volatility of a European option using the Black-Scholes model.
@@ -494,7 +626,8 @@ def implied_volatility(market_price, S, K, T, r, option_type="call"):
 
     try:
         return brentq(lambda sigma: bs_price(sigma) - market_price, 0.001, 3.0)
-    except:
+    except ValueError:
+        # No sign change in [0.001, 3.0], use implied_volatility_batch for wider ranges
         return None
     
 def add_indicators(df, selected_indicators):
@@ -510,5 +643,15 @@ def add_indicators(df, selected_indicators):
         df["BB_Lower"] = df["BB_Middle"] - 2 * df["Close"].rolling(window=20).std()
     return df
 
-def fetch_stock_data(ticker, start_date, end_date):
-    return yf.download(ticker, start=start_date, end=end_date, auto_adjust=True)
\ No newline at end of file
+def fetch_stock_data(ticker, start_date, end_date, offline: bool = False):
+    """
+    Price history through the local cache. A list of tickers is fetched in batched provider calls and
+    returned as one frame with (field, ticker) columns.
+
+    A ticker without data (unknown symbol, empty range, failed download or offline) gives an empty frame.
+    """
+    data = get_price_history_cache().get_histories(ticker if isinstance(ticker, (list, tuple)) else [ticker],
+                                                   start_date, end_date, offline=offline)
+    if isinstance(ticker, (list, tuple)):
+        return data
+    return split_by_ticker(data).get(ticker, pd.DataFrame())
\ No newline at end of file
@@ -11,16 +11,27 @@ import plotly.express as px
 import yfinance as yf
 import logging
 import warnings
-import cmdstanpy
+import threading
 import plotly
 import scipy.stats as si
 import streamlit as st
 import plotly.graph_objects as go
 
-from prophet import Prophet
 from pandas_datareader import data as pdr
 from pandas.errors import PerformanceWarning
 from multiprocessing import Pool
 from scipy.optimize import minimize, brentq
-from scipy.stats import norm
+from scipy.stats import norm, qmc
+from scipy.special import ndtr
+from scipy.linalg import solve_banded
+from scipy.signal import lfilter
 from datetime import *
+
+# Prophet (and the Stan backend it fits with) is optional: risk free rates can be projected with the
+# NumPy exponential smoothing and Vasicek methods in RFR_Projection without it
+try:
+    import cmdstanpy
+    from prophet import Prophet
+except ImportError:
+    cmdstanpy = None
+    Prophet = None
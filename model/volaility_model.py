@@ -1,4 +1,5 @@
 from .utils import *
+from .price_history_cache import get_price_history_cache
 
 class Return_Volatility_Minimisation:
     def __init__(self, prices=None, log_returns=None, dt=1/252):
@@ -25,9 +26,9 @@ class Return_Volatility_Minimisation:
 
     def fetch_historical_data(self, ticker, start, end, price_column='Adj Close'):
         """
-        Retrieve historical stock price data using yfinance.
+        Retrieve historical stock price data through the local price history cache.
         """
-        data = yf.download(ticker, start=start, end=end)
+        data = get_price_history_cache().get_history(ticker, start, end)
         if data.empty:
             raise ValueError(f"No data found for ticker: {ticker}")
         
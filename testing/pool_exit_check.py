@@ -0,0 +1,39 @@
+"""
+Checks that a process which runs a parallel Numba kernel and then prices with the persistent
+simulation pool still exits. Run from the repository root: python testing/pool_exit_check.py
+"""
+import subprocess
+import sys
+
+# Heston paths run the parallel Numba kernel in the parent (run_adaptive) before the pool starts
+SCENARIO = """
+import pandas as pd
+from model.euro_option_simulation import European_Option_Simulation
+from model.option_strike import Strike
+from model.numba_kernels import NUMBA_AVAILABLE
+
+if __name__ == "__main__":
+    simulation = European_Option_Simulation("Heston Stochastic Volatility", Strike(100), 4000, 100, 0.04, 1 / 365,
+                                            0.2, 0.5, pd.DataFrame({"Rate": [0.04]}), seed=1)
+    adaptive = simulation.run_adaptive()
+    call_price, put_price, _ = simulation.run_multiprocessing(2)
+    print(f"Numba: {NUMBA_AVAILABLE}, adaptive call: {adaptive['call price']:.4f}, pool call: {call_price:.4f}, pool put: {put_price:.4f}")
+"""
+
+def main(timeout: int = 180):
+    try:
+        result = subprocess.run([sys.executable, "-c", SCENARIO], capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        print(f"FAILED: the process did not exit within {timeout} seconds")
+        return 1
+
+    print(result.stdout.strip())
+    if result.returncode != 0:
+        print(f"FAILED: exit code {result.returncode}\n{result.stderr}")
+        return 1
+
+    print("OK: exited cleanly")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+import math
+import numpy as np
+import pandas as pd
+import pytest
+from model.euro_option_simulation import European_Option_Simulation
+from model.option_strike import Strike
+
+def make_simulation(tte: float = 0.5, **kwargs):
+    return European_Option_Simulation("Geometric Brownian Motion", Strike(100), 20000, 100, 0.04, 1 / 365, 0.2, tte,
+                                      pd.DataFrame({"Rate": [0.04]}), seed=3, **kwargs)
+
+def test_price_chain_rejects_expiry_beyond_tte():
+    simulation = make_simulation()
+
+    with pytest.raises(ValueError):
+        simulation.price_chain([100], [0.25, 0.75])
+    with pytest.raises(ValueError):
+        simulation.get_discount_factor(0.75)
+
+def test_discount_factor_uses_simulated_horizon():
+    simulation = make_simulation()
+    horizon = simulation.get_steps() * simulation.delta_t
+
+    assert simulation.get_discount_factor() == pytest.approx(math.exp(-0.04 * horizon))
+    assert simulation.get_discount_factor(0.1) == pytest.approx(math.exp(-0.04 * round(0.1 * 365) / 365))
+
+def test_sobol_adaptive_std_error_comes_from_chunk_replicates():
+    sobol = make_simulation(sampler="Sobol").run_adaptive(target_std_error=0.005, chunk_size=4096)
+    pseudo_random = make_simulation().run_adaptive(target_std_error=0.005, chunk_size=4096)
+
+    assert sobol["simulations"] < pseudo_random["simulations"]
+    assert np.all(np.isfinite(sobol["call confidence interval"]))
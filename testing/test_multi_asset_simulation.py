@@ -0,0 +1,16 @@
+import numpy as np
+import pandas as pd
+from model.multi_asset_simulation import Multi_Asset_Simulation
+
+def test_from_price_history_recovers_trading_day_volatility():
+    rng = np.random.default_rng(7)
+    volatilities, days = np.array([0.16, 0.32]), 252 * 20
+    log_returns = rng.standard_normal((days, 2)) * volatilities / np.sqrt(252)
+    dates = pd.bdate_range("2000-01-03", periods=days + 1)
+    prices = pd.DataFrame(100 * np.exp(np.vstack([np.zeros(2), np.cumsum(log_returns, axis=0)])),
+                          index=dates, columns=["A", "B"])
+
+    simulation = Multi_Asset_Simulation.from_price_history(prices, 0.0, 1 / 252, 1.0, pd.DataFrame({"Rate": [0.04]}))
+
+    np.testing.assert_allclose(simulation.volatilities, volatilities, rtol=0.03)
+    np.testing.assert_allclose(simulation.initial_prices, prices.iloc[-1].to_numpy())
@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+import model.price_history_cache as price_history_cache
+from model.market_data_provider import Market_Data_Provider, to_field_ticker_columns
+from model.price_history_cache import Price_History_Cache
+from model.udf import fetch_stock_data
+
+class Failing_Provider(Market_Data_Provider):
+    def get_history(self, tickers: list, start, end):
+        raise ConnectionError("network unreachable")
+
+@pytest.mark.parametrize("offline", [True, False])
+def test_fetch_stock_data_without_prices_is_empty(tmp_path, monkeypatch, offline):
+    cache = Price_History_Cache(str(tmp_path), provider=Failing_Provider(), offline=offline)
+    monkeypatch.setattr(price_history_cache, "_price_history_cache", cache)
+
+    data = fetch_stock_data("AAPL", "2024-01-01", "2024-03-01")
+
+    assert isinstance(data, pd.DataFrame) and data.empty
+    with pytest.raises(ValueError):
+        cache.get_history("AAPL", "2024-01-01", "2024-03-01")
+
+class Counting_Provider(Market_Data_Provider):
+    """Daily closes from first_date to last_date, counting the provider calls."""
+
+    def __init__(self, first_date, last_date):
+        self.dates = pd.bdate_range(first_date, last_date)
+        self.calls = 0
+
+    def get_history(self, tickers: list, start, end):
+        self.calls += 1
+        dates = self.dates[(self.dates >= start) & (self.dates < end)]
+        if dates.empty:
+            return pd.DataFrame()
+        data = pd.DataFrame({("Close", ticker): 100.0 for ticker in tickers}, index=dates)
+        return to_field_ticker_columns(data, tickers)
+
+def test_empty_range_before_listing_is_fetched_once(tmp_path):
+    provider = Counting_Provider("2020-06-01", "2021-12-31")
+    cache = Price_History_Cache(str(tmp_path), provider=provider)
+
+    assert not cache.get_history("NEW", "2019-01-01", "2021-01-01").empty
+    cache.get_history("NEW", "2010-01-01", "2021-01-01")
+    cache.get_history("NEW", "2010-01-01", "2021-01-01")
+
+    assert provider.calls == 2
+
+def test_long_empty_range_near_today_is_fetched_again(tmp_path):
+    today = pd.Timestamp.today().normalize()
+    provider = Counting_Provider(today - pd.Timedelta(days=400), today - pd.Timedelta(days=60))
+    cache = Price_History_Cache(str(tmp_path), provider=provider)
+
+    cache.get_history("OLD", today - pd.Timedelta(days=300), today - pd.Timedelta(days=50))
+    cache.get_history("OLD", today - pd.Timedelta(days=300), today)
+    cache.get_history("OLD", today - pd.Timedelta(days=300), today)
+
+    # The empty last 50 days may be a failed download, so they are not recorded as fetched
+    assert provider.calls == 3